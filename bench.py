@@ -0,0 +1,168 @@
+'''
+Benchmark runner for every day's solvers.
+
+Runs each day's parse and part functions (see solvers.py) a number of times,
+timing parse and solve separately with `time.perf_counter_ns()`, and reports
+min/median/p95 as a table and optionally as JSON so runs can be compared.
+
+    python bench.py --days 1 5 11 --repeat 10 --json bench_output.json
+'''
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from typing import Any, Dict, List
+
+import history
+import progress
+import solvers
+
+
+def percentile(samples: List[int], pct: float) -> int:
+    '''Nearest-rank percentile, so the result is always an observed sample.'''
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarise(samples: List[int]) -> Dict[str, int]:
+    return {
+        'min': min(samples),
+        'median': int(statistics.median(samples)),
+        'p95': percentile(samples, 95),
+    }
+
+
+def bench_part(day: int, part: int, filename: str, repeat: int, warmup: int = 0) -> Dict[str, Any]:
+    '''
+    Parse and solve `repeat` times after `warmup` untimed runs. The input is
+    re-parsed every run because some solvers modify their parsed input.
+    '''
+    for _ in range(warmup):
+        solvers.solve(day, part, solvers.parse(day, filename))
+
+    parse_ns = []
+    solve_ns = []
+    answer = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        parsed = solvers.parse(day, filename)
+        parsed_at = time.perf_counter_ns()
+        answer = solvers.solve(day, part, parsed)
+        end = time.perf_counter_ns()
+
+        parse_ns.append(parsed_at - start)
+        solve_ns.append(end - parsed_at)
+
+    return {
+        'day': day,
+        'part': part,
+        'input': filename,
+        'answer': answer,
+        'repeat': repeat,
+        'parse': summarise(parse_ns),
+        'solve': summarise(solve_ns),
+        'parse_ns': parse_ns,
+        'solve_ns': solve_ns,
+    }
+
+
+def bench_import(day: int, repeat: int) -> Dict[str, int]:
+    '''
+    Times importing the day's module in a fresh interpreter with `-X importtime`,
+    so startup cost (including any heavy dependencies) is tracked alongside the
+    solve times. Returns the summary of the cumulative import time in ns.
+    '''
+    module = f'day{day:02d}'
+    import_ns = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+        )
+        # Lines look like "import time:  self [us] | cumulative | imported package".
+        for line in completed.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                import_ns.append(int(fields[1]) * 1000)
+    return summarise(import_ns)
+
+
+def print_table(results: List[Dict[str, Any]], file=sys.stdout):
+    header = f"{'day':>3} {'part':>4} {'answer':>20} {'import median':>14} {'parse median':>13} {'solve min':>12} {'solve median':>13} {'solve p95':>12}"
+    print(header, file=file)
+    print('-' * len(header), file=file)
+    for result in results:
+        if 'error' in result:
+            print(f"{result['day']:>3} {result['part']:>4} error: {result['error']}", file=file)
+            continue
+        parse, solve = result['parse'], result['solve']
+        import_median = f"{result['import']['median'] / 1e9:>14.3e}" if 'import' in result else f"{'-':>14}"
+        print(
+            f"{result['day']:>3} {result['part']:>4} {result['answer']:>20} {import_median} "
+            f"{parse['median'] / 1e9:>13.3e} {solve['min'] / 1e9:>12.3e} "
+            f"{solve['median'] / 1e9:>13.3e} {solve['p95'] / 1e9:>12.3e}",
+            file=file,
+        )
+
+
+def run(days: List[int], parts: List[int], repeat: int, warmup: int, test: bool, imports: bool = False) -> List[Dict[str, Any]]:
+    results = []
+    for day in days:
+        filename = solvers.input_filename(day, test)
+        import_summary = bench_import(day, repeat) if imports else None
+        for part in solvers.parts(day):
+            if part not in parts:
+                continue
+            try:
+                result = bench_part(day, part, filename, repeat, warmup)
+                if import_summary:
+                    result['import'] = import_summary
+                results.append(result)
+            except Exception as e:
+                # Keep going so one broken day doesn't hide the timings of the rest.
+                results.append({'day': day, 'part': part, 'input': filename, 'error': repr(e)})
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', nargs='+', type=int, default=solvers.DAYS, help="Which days to run, default to all.")
+    parser.add_argument('--parts', nargs='+', type=int, default=[1, 2], help="Which parts to run, default to both.")
+    parser.add_argument('--repeat', type=int, default=5, help="Number of timed runs per part.")
+    parser.add_argument('--warmup', type=int, default=0, help="Number of untimed runs before timing.")
+    parser.add_argument('--test', action='store_true', help="Use the test inputs instead of the puzzle inputs.")
+    parser.add_argument('--imports', action='store_true', help="Also time importing each day's module in a fresh interpreter.")
+    parser.add_argument('--import-budget', type=float, help="With --imports, fail if any day's median import time exceeds this many seconds.")
+    parser.add_argument('--json', help="Write results as JSON to this file, or '-' for stdout.")
+    parser.add_argument('--quiet', action='store_true', help="Don't report the solvers' progress.")
+    parser.add_argument('--record', action='store_true', help="Append the results to the benchmark history (see history.py).")
+    args = parser.parse_args()
+    progress.set_quiet(args.quiet)
+
+    results = run(args.days, args.parts, args.repeat, args.warmup, args.test, args.imports)
+
+    if args.json == '-':
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(results)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2)
+
+    if args.record:
+        run_id = history.record(results)
+        print(f"recorded run {run_id} to {history.DEFAULT_HISTORY}", file=sys.stderr)
+
+    if args.import_budget is not None:
+        over_budget = sorted({r['day'] for r in results if 'import' in r and r['import']['median'] / 1e9 > args.import_budget})
+        for day in over_budget:
+            print(f"day {day:02d} import time is over the {args.import_budget:e} second budget", file=sys.stderr)
+        if over_budget:
+            sys.exit(1)
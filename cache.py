@@ -0,0 +1,130 @@
+'''
+Persistent cache of answers, keyed by day, part, solver version and input hash.
+
+The solver version is a hash of the day's source file and solvers.py, so editing
+a solution invalidates its cached answers without having to bump anything by
+hand. Entries also record how long parsing and solving took, and the least
+recently used entries are evicted once the cache holds more than `max_entries`.
+
+Answers are looked up before anything is imported or parsed, so a hit costs one
+hash of the input file.
+'''
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from typing import Any, Dict, Optional
+
+import solvers
+
+
+DEFAULT_DIRECTORY = '.aoc_cache'
+DEFAULT_MAX_ENTRIES = 256
+
+
+def file_sha256(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def solver_version(day: int) -> str:
+    digest = hashlib.sha256()
+    for filename in (f'day{day:02d}.py', 'solvers.py'):
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache(object):
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._index_filename = os.path.join(directory, 'results.json')
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._index_filename, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file and rename so a crash can't leave a truncated index.
+        fd, temp_filename = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(temp_filename, self._index_filename)
+
+    @staticmethod
+    def key(day: int, part: int, filename: str) -> str:
+        return f"{day}:{part}:{solver_version(day)}:{file_sha256(filename)}"
+
+    def get(self, day: int, part: int, filename: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(self.key(day, part, filename))
+        if entry is None:
+            return None
+        entry['last_used'] = time.time()
+        self._save()
+        return entry
+
+    def put(self, day: int, part: int, filename: str, answer: int, parse_ns: int, solve_ns: int):
+        now = time.time()
+        self._entries[self.key(day, part, filename)] = {
+            'day': day,
+            'part': part,
+            'input': filename,
+            'answer': answer,
+            'parse_ns': parse_ns,
+            'solve_ns': solve_ns,
+            'created': now,
+            'last_used': now,
+        }
+        if len(self._entries) > self.max_entries:
+            by_last_used = sorted(self._entries, key=lambda k: self._entries[k]['last_used'])
+            for key in by_last_used[:len(self._entries) - self.max_entries]:
+                del self._entries[key]
+        self._save()
+
+    def timings(self) -> Dict[tuple, int]:
+        '''
+        The most recently recorded parse plus solve time in ns for each
+        (day, part, input sha256), whatever the solver version, so scheduling
+        one input isn't thrown off by timings from another (eg: the test input).
+        '''
+        timings = {}
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]['created']):
+            input_sha256 = key.rsplit(':', 1)[1]
+            timings[(entry['day'], entry['part'], input_sha256)] = entry['parse_ns'] + entry['solve_ns']
+        return timings
+
+    def clear(self):
+        self._entries = {}
+        self._save()
+
+
+def solve(day: int, part: int, filename: str, cache: Optional[ResultCache] = None) -> Dict[str, Any]:
+    '''
+    Returns the answer for one part along with its parse and solve times. With a
+    cache, a hit returns the stored answer and timings without parsing the input.
+    '''
+    if cache is not None:
+        entry = cache.get(day, part, filename)
+        if entry is not None:
+            return {'answer': entry['answer'], 'parse_ns': entry['parse_ns'], 'solve_ns': entry['solve_ns'], 'cached': True}
+
+    start = time.perf_counter_ns()
+    parsed = solvers.parse(day, filename)
+    parsed_at = time.perf_counter_ns()
+    answer = solvers.solve(day, part, parsed)
+    end = time.perf_counter_ns()
+
+    if cache is not None:
+        cache.put(day, part, filename, answer, parsed_at - start, end - parsed_at)
+    return {'answer': answer, 'parse_ns': parsed_at - start, 'solve_ns': end - parsed_at, 'cached': False}
@@ -1,14 +1,79 @@
+import argparse
 import time
-import os
-import sys
+
+import instrument
+import render
+
+
+def _parse_movement_bytes(raw: bytes):
+    '''
+    Parses complete movement lines into two NumPy arrays, whether each move is
+    to the right and its distance, without a Python level loop over the lines.
+
+    Every line starts with a direction byte, so the digits between one
+    direction and the next make up that line's distance. Each digit is scaled
+    by 10 to the power of the number of digits after it in the same line, and
+    the scaled digits are summed per line.
+    '''
+    import numpy as np
+
+    data = np.frombuffer(raw, dtype=np.uint8)
+    starts = np.flatnonzero((data == ord('L')) | (data == ord('R')))
+    if len(starts) == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0, dtype=np.int64)
+
+    digit_positions = np.flatnonzero((data >= ord('0')) & (data <= ord('9')))
+    line_of_digit = np.searchsorted(starts, digit_positions, side='right') - 1
+
+    digit_counts = np.bincount(line_of_digit, minlength=len(starts))
+    line_digit_ends = np.cumsum(digit_counts)
+    digits_after = line_digit_ends[line_of_digit] - np.arange(len(digit_positions)) - 1
+    scaled_digits = (data[digit_positions] - ord('0')).astype(np.int64) * np.power(10, digits_after, dtype=np.int64)
+    distances = np.add.reduceat(scaled_digits, line_digit_ends - digit_counts)
+
+    return data[starts] == ord('R'), distances
+
+
+def parse_movement_arrays(file: str):
+    '''
+    Parses the whole movement file into two NumPy arrays, whether each move
+    is to the right and its distance. Directions are kept separate from
+    distances rather than as signed distances since 'L0' and 'R0' differ
+    when the dial starts outside 0..numbers-1 (eg: the default position of
+    50 on a small dial).
+    '''
+    with open(file, 'rb') as f:
+        return _parse_movement_bytes(f.read())
+
+
+def generate_movement_batches(file: str, chunk_size: int = 1 << 20):
+    '''
+    Like `parse_movement_arrays` but reads the file `chunk_size` bytes at a
+    time, yielding the arrays for the complete lines in each chunk. A line
+    split across chunks is carried over to the next one, so memory use is
+    bounded by the chunk size rather than the file size.
+    '''
+    remainder = b''
+    with open(file, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            data = remainder + chunk
+            cut = data.rfind(b'\n') + 1
+            remainder = data[cut:]
+            if cut:
+                yield _parse_movement_bytes(data[:cut])
+    if remainder.strip():
+        yield _parse_movement_bytes(remainder)
 
 
 class Dial(object):
-    def __init__(self, numbers: int, visualise: bool=False):
+    def __init__(self, numbers: int, visualise: bool=False, position: int=50):
         self.numbers = numbers
         self.old_password = 0
         self.new_password = 0
-        self.position = 50
+        self.position = position
         self._visualise = visualise
 
     def generate_movements(self, file: str):
@@ -19,8 +84,7 @@ class Dial(object):
                     yield (line[0], int(line[1:]))
     
     def _visualize_turn(self, movement: tuple[str, int]):
-        """Prints a single frame of the dial animation."""
-        os.system('clear')
+        """Draws a single frame of the dial animation."""
 
         vis_width = 50
         # Scale the current position to the visualization width
@@ -34,16 +98,15 @@ class Dial(object):
         direction, distance = movement
         move_str = f"Move: {direction}{distance}"
         
-        print("--- Dial Visualization ---")
-        print(dial_vis_str)
-        print(f"Position: {self.position}/{self.numbers}")
-        print(move_str)
-        print(f"Old Password: {self.old_password}")
-        print(f"New Password: {self.new_password}")
-        print("--------------------------")
-        
-        # Pause to make the animation viewable
-        time.sleep(0.05)
+        render.shared().frame([
+            "--- Dial Visualization ---",
+            dial_vis_str,
+            f"Position: {self.position}/{self.numbers}",
+            move_str,
+            f"Old Password: {self.old_password}",
+            f"New Password: {self.new_password}",
+            "--------------------------",
+        ])
 
     def _turn(self, movement: tuple[str, int]) -> None:
         if self._visualise:
@@ -69,22 +132,126 @@ class Dial(object):
     def apply_movements(self, movements: tuple[str, int]):
         for movement in movements:
             self._turn(movement)
-        # Print a final blank line to move past the animation
+        # Draw the final frame and move past the animation
         if self._visualise:
-            print()  
+            render.close_shared()
+
+    def apply_movement_arrays(self, rights, distances) -> None:
+        '''
+        Vectorised equivalent of `apply_movements` for the arrays from
+        `parse_movement_arrays`, giving the same positions and passwords.
+
+        The position after each move is the running sum of the deltas modulo
+        `numbers`, and each move's contribution to the new password uses the
+        same distance from zero as `_turn`, computed from the position before
+        the move.
+        '''
+        import numpy as np
+
+        if len(distances) == 0:
+            return
+
+        deltas = np.where(rights, distances, -distances) % self.numbers
+        positions = (self.position + np.cumsum(deltas)) % self.numbers
+        previous_positions = np.empty_like(positions)
+        previous_positions[0] = self.position
+        previous_positions[1:] = positions[:-1]
+
+        total_distance_from_zero = np.where(
+            rights,
+            previous_positions + distances,
+            (self.numbers - previous_positions) % self.numbers + distances,
+        )
+
+        self.old_password += int(np.count_nonzero(positions == 0))
+        self.new_password += int((total_distance_from_zero // self.numbers).sum())
+        self.position = int(positions[-1])
+
+    def apply_movement_batches(self, batches) -> None:
+        for rights, distances in batches:
+            self.apply_movement_arrays(rights, distances)
+
+
+def simulate_dials(dials: list[Dial], batches, max_cells: int = 1 << 22) -> None:
+    '''
+    Applies one stream of movement batches (from `generate_movement_batches` or
+    a single `parse_movement_arrays` result in a list) to many dials at once,
+    updating each dial's position and passwords as `apply_movement_arrays`
+    would. The movements are parsed once and every dial is evaluated together
+    as a (dials x moves) array, processed in slices of at most `max_cells`
+    elements to bound memory.
+    '''
+    import numpy as np
+
+    if not dials:
+        return
+
+    numbers = np.array([dial.numbers for dial in dials], dtype=np.int64)[:, None]
+    positions = np.array([dial.position for dial in dials], dtype=np.int64)
+    old_passwords = np.zeros(len(dials), dtype=np.int64)
+    new_passwords = np.zeros(len(dials), dtype=np.int64)
+
+    step = max(1, max_cells // len(dials))
+    for rights, distances in batches:
+        for offset in range(0, len(distances), step):
+            rights_slice = rights[offset:offset+step]
+            distances_slice = distances[offset:offset+step]
+
+            deltas = np.where(rights_slice, distances_slice, -distances_slice)[None, :] % numbers
+            new_positions = (positions[:, None] + np.cumsum(deltas, axis=1)) % numbers
+            previous_positions = np.concatenate((positions[:, None], new_positions[:, :-1]), axis=1)
+
+            total_distance_from_zero = np.where(
+                rights_slice,
+                previous_positions + distances_slice,
+                (numbers - previous_positions) % numbers + distances_slice,
+            )
+
+            old_passwords += np.count_nonzero(new_positions == 0, axis=1)
+            new_passwords += (total_distance_from_zero // numbers).sum(axis=1)
+            positions = new_positions[:, -1]
+
+    for dial, position, old_password, new_password in zip(dials, positions, old_passwords, new_passwords):
+        dial.position = int(position)
+        dial.old_password += int(old_password)
+        dial.new_password += int(new_password)
 
 if __name__ == '__main__':
-    visualize_arg = len(sys.argv) > 1 and sys.argv[1] == '--visualise'
+    parser = argparse.ArgumentParser()
+    parser.add_argument('filename', nargs='?', default='day01_input01.txt', help="The input file with dial movements.")
+    parser.add_argument('--visualise', action='store_true', help="Show the dial animation.")
+    parser.add_argument('--numpy', action='store_true', help="Parse and apply all movements at once with NumPy.")
+    parser.add_argument('--stream', action='store_true', help="Like --numpy, but read the file in fixed size chunks.")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help="Chunk size in bytes for --stream.")
+    parser.add_argument('--dials', nargs='+', metavar='NUMBERS[:POSITION]', help="Simulate several dials in one pass over the movements, eg: 100:50 1000:0.")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
 
-    dial = Dial(100, visualize_arg)
-    movements_generator = dial.generate_movements('day01_input01.txt')
-    #movements_generator = dial.generate_movements('day01_test_input01.txt')
+    dial = Dial(100, args.visualise)
+    dials = []
+    for spec in args.dials or []:
+        numbers, _, position = spec.partition(':')
+        dials.append(Dial(int(numbers), position=int(position or 50)))
     
     start_time = time.time()
-    dial.apply_movements(movements_generator)
+    if dials:
+        batches = generate_movement_batches(args.filename, args.chunk_size)
+        instrument.run(args, 'parts 1 and 2', simulate_dials, dials, batches)
+    elif args.stream:
+        batches = generate_movement_batches(args.filename, args.chunk_size)
+        instrument.run(args, 'parts 1 and 2', dial.apply_movement_batches, batches)
+    elif args.numpy:
+        rights, distances = instrument.run(args, 'parse', parse_movement_arrays, args.filename)
+        instrument.run(args, 'parts 1 and 2', dial.apply_movement_arrays, rights, distances)
+    else:
+        movements_generator = dial.generate_movements(args.filename)
+        instrument.run(args, 'parts 1 and 2', dial.apply_movements, movements_generator)
     end_time = time.time()
 
-    print(f"password: {dial.old_password}")
-    print(f"new password: {dial.new_password}")
+    if dials:
+        for spec, d in zip(args.dials, dials):
+            print(f"dial {spec} - password: {d.old_password} - new password: {d.new_password}")
+    else:
+        print(f"password: {dial.old_password}")
+        print(f"new password: {dial.new_password}")
     print(f"solving time: {end_time - start_time:e} seconds")
-
@@ -1,8 +1,10 @@
-import math
+import argparse
+import concurrent.futures
 import re
-import sys
 import time
 
+import instrument
+
 def parse_ranges(file: str) -> list[list[int, int]]:
     ranges = []
     with open(file, 'r') as f:
@@ -13,6 +15,17 @@ def parse_ranges(file: str) -> list[list[int, int]]:
 
     return ranges
 
+def merge_ranges(ranges):
+    '''Sorts the ranges and merges the ones that overlap or touch, so no ID is counted twice.'''
+    merged = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], stop)
+        else:
+            merged.append([start, stop])
+
+    return merged
+
 def find_simple_invalid_ids(ranges):
     invalid_ids = []
     for start, stop in ranges:
@@ -40,7 +53,97 @@ def find_complex_invalid_ids(ranges):
     return invalid_ids
 
 def _number_of_digits(number):
-    return math.floor(math.log10(number)) + 1
+    # Not floor(log10(number)) + 1, log10 rounds 10^k - 1 up to k for k >= 15.
+    return len(str(number))
+
+def _count_and_sum_multiples(multiplier, lowest, highest, start, stop):
+    '''
+    Count and sum of `multiplier * x` over lowest <= x <= highest, keeping only
+    the products that fall in [start, stop]. The products are an arithmetic
+    series so this is just working out the bounds on x.
+    '''
+    lowest = max(lowest, -(-start // multiplier))
+    highest = min(highest, stop // multiplier)
+    if lowest > highest:
+        return 0, 0
+    count = highest - lowest + 1
+    return count, multiplier * (lowest + highest) * count // 2
+
+def sum_simple_invalid_ids(ranges):
+    '''
+    Same answer as sum(find_simple_invalid_ids(ranges)) without looking at any numbers.
+
+    A number with 2h digits whose halves are the same half x is x * (10^h + 1),
+    so for every even length in a range we sum those multiples of 10^h + 1
+    with x having h digits.
+    '''
+    total = 0
+    for start, stop in merge_ranges(ranges):
+        for length in range(_number_of_digits(start), _number_of_digits(stop)+1):
+            if length % 2:
+                continue
+            half = length // 2
+            total += _count_and_sum_multiples(10**half + 1, 10**(half-1), 10**half - 1, start, stop)[1]
+
+    return total
+
+def _mobius(n):
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+def count_and_sum_repeated_ids(start, stop):
+    '''
+    Count and sum of the numbers in [start, stop] made of a pattern repeated at
+    least twice, without generating any of them.
+
+    A length L number repeating a d digit pattern x is x * (10^L - 1) / (10^d - 1),
+    so for each period d dividing L those numbers are an arithmetic series
+    (see _count_and_sum_multiples). A number repeating with period d also repeats
+    with every multiple of d dividing L, so summing over all the periods counts
+    some numbers several times. Weighting period d by -mobius(L / d) counts every
+    number exactly once: eg for L = 6 it's periods 2 + 3 - 1, since the numbers
+    repeating with periods 2 and 3 are the ones repeating with period 1.
+    '''
+    count, total = 0, 0
+    for length in range(_number_of_digits(start), _number_of_digits(stop)+1):
+        for period in range(1, (length // 2)+1):
+            if length % period:
+                continue
+            weight = -_mobius(length // period)
+            if weight == 0:
+                continue
+            multiplier = (10**length - 1) // (10**period - 1)
+            period_count, period_total = _count_and_sum_multiples(multiplier, 10**(period-1), 10**period - 1, start, stop)
+            count += weight * period_count
+            total += weight * period_total
+
+    return count, total
+
+def sum_complex_invalid_ids(ranges):
+    '''Same answer as sum(generate_complex_invalid_ids(ranges)).'''
+    return sum(count_and_sum_repeated_ids(start, stop)[1] for start, stop in merge_ranges(ranges))
+
+def parallel_sum(solver, ranges, workers=1):
+    '''
+    Runs `solver` (sum_simple_invalid_ids or sum_complex_invalid_ids) on the
+    merged ranges split into `workers` shards, each in its own process, and
+    adds up the results. Merging first means the shards don't overlap.
+    '''
+    merged = merge_ranges(ranges)
+    if workers <= 1:
+        return solver(merged)
+
+    shards = [merged[i::workers] for i in range(workers)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(solver, shards))
 
 def generate_complex_invalid_ids(ranges):
     '''
@@ -77,28 +180,70 @@ def generate_complex_invalid_ids(ranges):
 
 
 
-if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
-    else:
-        raise ValueError('Missing filename argument.')
-
-    ranges = parse_ranges(filename)
-    start_simple = time.time()
-    simple_invalid_ids = find_simple_invalid_ids(ranges)
-    end_simple = time.time()
+def _boundary_ranges(max_length=18, width=20):
+    '''Small ranges either side of every power of 10 up to 10^max_length, where digit counts change.'''
+    ranges = []
+    for length in range(1, max_length+1):
+        boundary = 10**length
+        ranges.append([max(1, boundary - width), boundary - 1])
+        ranges.append([boundary - 1, boundary - 1])
+        ranges.append([max(1, boundary - width // 2), boundary + width // 2])
+    return ranges
 
-    start_complex = time.time()
-    complex_invalid_ids = find_complex_invalid_ids(ranges)
-    end_complex = time.time()
+def check_digit_boundaries(max_length=18):
+    '''
+    Checks the closed form and inclusion-exclusion solvers against
+    find_simple_invalid_ids() and find_complex_invalid_ids() around every power of 10.
+    '''
+    for start, stop in _boundary_ranges(max_length):
+        expected = sum(find_simple_invalid_ids([[start, stop]]))
+        assert sum_simple_invalid_ids([[start, stop]]) == expected, f"part 1 closed form is wrong for {start}-{stop}"
 
-    start_generate_complex = time.time()
-    generated_complex_invalid_ids = generate_complex_invalid_ids(ranges)
-    end_generate_complex = time.time()
+        complex_ids = find_complex_invalid_ids([[start, stop]])
+        expected = (len(complex_ids), sum(complex_ids))
+        assert count_and_sum_repeated_ids(start, stop) == expected, f"part 2 inclusion-exclusion is wrong for {start}-{stop}"
 
 
-    print(f"part 1: {sum(simple_invalid_ids)} - time: {end_simple - start_simple:e} seconds")
-    print(f"part 2: {sum(complex_invalid_ids)} - time: {end_complex - start_complex:e} seconds")
-    print(f"part 3: {sum(generated_complex_invalid_ids)} - time: {end_generate_complex - start_generate_complex:e} seconds")
 
-    
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('filename', help="The input file with ID ranges.")
+    parser.add_argument('--workers', type=int, default=1, help="Number of processes for the closed form and inclusion-exclusion solvers.")
+    parser.add_argument('--slow', action='store_true', help="Also run the original solvers that go through every ID, to compare. They can't finish on huge ranges.")
+    parser.add_argument('--check', action='store_true', help="Also check the closed form solvers against the enumerating ones where digit counts change.")
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    ranges = parse_ranges(args.filename)
+
+    if args.slow:
+        start_simple = time.time()
+        simple_invalid_ids = instrument.run(args, 'part 1 enumerating', find_simple_invalid_ids, ranges)
+        end_simple = time.time()
+
+        start_complex = time.time()
+        complex_invalid_ids = instrument.run(args, 'part 2 enumerating', find_complex_invalid_ids, ranges)
+        end_complex = time.time()
+
+        start_generate_complex = time.time()
+        generated_complex_invalid_ids = instrument.run(args, 'part 2 generating', generate_complex_invalid_ids, ranges)
+        end_generate_complex = time.time()
+
+        print(f"part 1 enumerating: {sum(simple_invalid_ids)} - time: {end_simple - start_simple:e} seconds")
+        print(f"part 2 enumerating: {sum(complex_invalid_ids)} - time: {end_complex - start_complex:e} seconds")
+        print(f"part 2 generating: {sum(generated_complex_invalid_ids)} - time: {end_generate_complex - start_generate_complex:e} seconds")
+
+    start_closed_form = time.time()
+    closed_form_sum = instrument.run(args, 'part 1', parallel_sum, sum_simple_invalid_ids, ranges, args.workers)
+    end_closed_form = time.time()
+
+    start_inclusion_exclusion = time.time()
+    inclusion_exclusion_sum = instrument.run(args, 'part 2', parallel_sum, sum_complex_invalid_ids, ranges, args.workers)
+    end_inclusion_exclusion = time.time()
+
+    print(f"part 1: {closed_form_sum} - time: {end_closed_form - start_closed_form:e} seconds")
+    print(f"part 2: {inclusion_exclusion_sum} - time: {end_inclusion_exclusion - start_inclusion_exclusion:e} seconds")
+
+    if args.check:
+        check_digit_boundaries()
+        print("digit boundary checks passed")
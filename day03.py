@@ -1,10 +1,12 @@
 import math
 import re
-import os
 import sys
 import time
 import argparse
 
+import instrument
+import render
+
 def parse_batteries(file: str) -> list[list[int]]:
     batteries = []
     with open(file, 'r') as f:
@@ -14,6 +16,25 @@ def parse_batteries(file: str) -> list[list[int]]:
 
     return batteries
 
+def parse_battery_array(file: str):
+    '''
+    Loads banks that all have the same number of batteries into a 2D NumPy
+    uint8 array, one row per bank, straight from the file's bytes.
+    '''
+    import numpy as np
+
+    with open(file, 'rb') as f:
+        raw = f.read().rstrip() + b'\n'
+    width = raw.index(b'\n')
+    if len(raw) % (width + 1):
+        raise ValueError(f"{file}: battery banks must all be the same length for --numpy")
+
+    data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width + 1)
+    # Ragged banks can still add up to a multiple of the first line's length.
+    if not (data[:, width] == ord('\n')).all():
+        raise ValueError(f"{file}: battery banks must all be the same length for --numpy")
+    return data[:, :width] - ord('0')
+
 def sort_battery_bank(battery_bank: list[int]) -> list[(int, int)]:
     sorted_battery_bank = []
     for index, value in enumerate(battery_bank):
@@ -42,9 +63,7 @@ def max_jolt_from_2_batteries(sorted_battery_bank: list[(int, int)]) -> int:
     return int(str(jolt_first_digit) + str(jolt_second_digit))
 
 def _visualize_jolt_construction(battery_bank: list[int], n: int, window: list[tuple[int, int]], max_combination: list[int], chosen_digit: int):
-    """Prints a single frame of the max jolt construction animation."""
-    os.system('clear')
-    
+    """Draws a single frame of the max jolt construction animation."""
     bank_str = " ".join(map(str, battery_bank))
     
     window_vis = [' '] * (2 * len(battery_bank) - 1)
@@ -58,15 +77,15 @@ def _visualize_jolt_construction(battery_bank: list[int], n: int, window: list[t
 
     window_str = "".join(window_vis)
 
-    print("--- Max Jolt Construction ---")
-    print(f"Battery Bank:     {bank_str}")
-    print(f"Search Window:    {window_str}")
-    print(f"Digits to find:   {n - len(max_combination)}")
-    print(f"Chosen digit:     {chosen_digit if chosen_digit is not None else '...'}")
-    print(f"Max Combination:  {''.join(map(str, max_combination))}")
-    print("-------------------------------")
-    
-    time.sleep(0.5)
+    render.shared().frame([
+        "--- Max Jolt Construction ---",
+        f"Battery Bank:     {bank_str}",
+        f"Search Window:    {window_str}",
+        f"Digits to find:   {n - len(max_combination)}",
+        f"Chosen digit:     {chosen_digit if chosen_digit is not None else '...'}",
+        f"Max Combination:  {''.join(map(str, max_combination))}",
+        "-------------------------------",
+    ])
 
 def max_jolt_from_n_batteries(battery_bank: list[int], n: int, visualise: bool = False) -> int:
     indexed_battery_bank = list(enumerate(battery_bank))
@@ -96,32 +115,193 @@ def max_jolt_from_n_batteries(battery_bank: list[int], n: int, visualise: bool =
     return max_jolt
     
 
+def max_jolt_stack(battery_bank: list[int], n: int) -> int:
+    '''
+    Same answer as max_jolt_from_n_batteries() in O(len(battery_bank)) for any n.
+
+    Goes through the bank once keeping a stack of chosen batteries, and while
+    there are still batteries we can afford to leave out, pops any smaller
+    battery on top of the stack when a bigger one comes along, since putting
+    the bigger one in its place always makes a bigger jolt.
+    '''
+    droppable = len(battery_bank) - n
+    stack = []
+    for battery in battery_bank:
+        while droppable and stack and stack[-1] < battery:
+            stack.pop()
+            droppable -= 1
+        stack.append(battery)
+
+    max_jolt = 0
+    for digit in stack[:n]:
+        max_jolt = max_jolt * 10 + digit
+    return max_jolt
+
+
+class BankIndex(object):
+    '''
+    Sparse table over a battery bank so the leftmost biggest battery of any
+    window is found in O(1), built once in O(len log len) and then shared by
+    every max_jolt() query on the bank, whatever the number of digits.
+
+    self._table[k][i] is the position of the leftmost biggest battery in
+    battery_bank[i:i + 2**k].
+    '''
+    def __init__(self, battery_bank: list[int]):
+        self.battery_bank = battery_bank
+        self._table = [list(range(len(battery_bank)))]
+        span = 1
+        while 2 * span <= len(battery_bank):
+            previous = self._table[-1]
+            level = []
+            for i in range(len(battery_bank) - 2 * span + 1):
+                left, right = previous[i], previous[i + span]
+                level.append(left if battery_bank[left] >= battery_bank[right] else right)
+            self._table.append(level)
+            span *= 2
+        self._max_jolts = {}
+
+    def max_position(self, start: int, stop: int) -> int:
+        '''Position of the leftmost biggest battery in battery_bank[start:stop+1].'''
+        level = (stop - start + 1).bit_length() - 1
+        left = self._table[level][start]
+        right = self._table[level][stop - (1 << level) + 1]
+        return left if self.battery_bank[left] >= self.battery_bank[right] else right
+
+    def max_jolt(self, n: int) -> int:
+        if n not in self._max_jolts:
+            max_jolt = 0
+            offset = 0
+            for remaining_digits in range(n, 0, -1):
+                position = self.max_position(offset, len(self.battery_bank) - remaining_digits)
+                max_jolt = max_jolt * 10 + self.battery_bank[position]
+                offset = position + 1
+            self._max_jolts[n] = max_jolt
+        return self._max_jolts[n]
+
+
+def index_batteries(batteries: list[list[int]]) -> list[BankIndex]:
+    return [BankIndex(bank) for bank in batteries]
+
+
+def total_max_jolt(bank_indices: list[BankIndex], n: int) -> int:
+    return sum(index.max_jolt(n) for index in bank_indices)
+
+
+def max_jolt_array(banks, n: int):
+    '''
+    max_jolt_from_n_batteries() for every row of a parse_battery_array() array
+    at once. For each digit, batteries outside each row's search window are
+    masked out and argmax picks the leftmost biggest battery left in every row.
+    '''
+    import numpy as np
+
+    rows, width = banks.shape
+    row_indices = np.arange(rows)
+    columns = np.arange(width)
+    signed_banks = banks.astype(np.int8)
+
+    offsets = np.zeros(rows, dtype=np.int64)
+    # More than 18 digits would overflow int64, so fall back to Python ints.
+    max_jolts = np.zeros(rows, dtype=np.int64 if n <= 18 else object)
+    for remaining_digits in range(n, 0, -1):
+        in_window = (columns >= offsets[:, None]) & (columns <= width - remaining_digits)
+        positions = np.argmax(np.where(in_window, signed_banks, -1), axis=1)
+        max_jolts = max_jolts * 10 + banks[row_indices, positions]
+        offsets = positions + 1
+
+    return max_jolts
+
+
+def benchmark(lengths: tuple[int, ...] = (10**5, 10**6), ns: tuple[int, ...] = (2, 12)):
+    '''Times the sorting and stack approaches on random banks of the given lengths.'''
+    import random
+
+    for length in lengths:
+        bank = [random.randint(1, 9) for _ in range(length)]
+        for n in ns:
+            start_time = time.perf_counter()
+            if n == 2:
+                sorted_jolt = max_jolt_from_2_batteries(sort_battery_bank(bank))
+            else:
+                sorted_jolt = max_jolt_from_n_batteries(bank, n)
+            sorted_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            stack_jolt = max_jolt_stack(bank, n)
+            stack_time = time.perf_counter() - start_time
+
+            assert sorted_jolt == stack_jolt
+            print(f"bank length {length} n {n}: sorting: {sorted_time:e} seconds - stack: {stack_time:e} seconds")
+
+
+def part1(batteries: list[list[int]]) -> int:
+    return sum(max_jolt_stack(bank, 2) for bank in batteries)
+
+
+def part2(batteries: list[list[int]], visualise: bool = False) -> int:
+    if not visualise:
+        return sum(max_jolt_stack(bank, 12) for bank in batteries)
+
+    # The stack doesn't have a window to show, so visualise the original approach.
+    total_jolt = 0
+    for bank in batteries:
+        total_jolt += max_jolt_from_n_batteries(bank, 12, visualise=visualise)
+    return total_jolt
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--visualise', action='store_true', help="Enable visualisation for part 2.")
+    parser.add_argument('--numpy', action='store_true', help="Solve all the banks at once with NumPy, they must all be the same length.")
+    parser.add_argument('--index', action='store_true', help="Build a range max index per bank once and answer both parts from it.")
+    parser.add_argument('--digits', nargs='+', type=int, default=[], help="Also report the total jolt for these numbers of digits, using the range max index.")
+    parser.add_argument('--benchmark', action='store_true', help="Also compare the sorting and stack approaches on banks of 10^5 and 10^6 batteries.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
 
-    batteries = parse_batteries(args.filename)
+    if args.numpy:
+        batteries = parse_battery_array(args.filename)
+    else:
+        batteries = parse_batteries(args.filename)
+
+    if args.index or args.digits:
+        start_index_time = time.time()
+        bank_indices = instrument.run(args, 'index', index_batteries, parse_batteries(args.filename))
+        end_index_time = time.time()
+        print(f"range max index - time: {end_index_time - start_index_time:e} seconds")
 
     start_part1_time = time.time()
-    sorted_batteries = [sort_battery_bank(bank) for bank in batteries]
-    total_jolt = 0
-    for bank in sorted_batteries:
-        max_jolt = max_jolt_from_2_batteries(bank)
-        total_jolt += max_jolt
+    if args.numpy:
+        total_jolt = int(instrument.run(args, 'part 1', max_jolt_array, batteries, 2).sum())
+    elif args.index:
+        total_jolt = instrument.run(args, 'part 1', total_max_jolt, bank_indices, 2)
+    else:
+        total_jolt = instrument.run(args, 'part 1', part1, batteries)
     end_part2_time = time.time()
     print(f"part 1 total jolt: {total_jolt} - time: {end_part2_time - start_part1_time:e} seconds")
 
     start_part2_time = time.time()
-    total_jolt = 0
-    for bank in batteries:
-        total_jolt += max_jolt_from_n_batteries(bank, 12, visualise=args.visualise)
+    if args.numpy:
+        total_jolt = int(instrument.run(args, 'part 2', max_jolt_array, batteries, 12).sum())
+    elif args.index:
+        total_jolt = instrument.run(args, 'part 2', total_max_jolt, bank_indices, 12)
+    else:
+        total_jolt = instrument.run(args, 'part 2', part2, batteries, visualise=args.visualise)
     end_part2_time = time.time()
 
     if args.visualise:
-        # Print a final blank line to move past the animation
-        print()
+        # Draw the final frame and move past the animation
+        render.close_shared()
+
+    print(f"part 2 total jolt: {total_jolt} - time: {end_part2_time - start_part2_time:e} seconds")
+
+    for n in args.digits:
+        start_digits_time = time.time()
+        total_jolt = total_max_jolt(bank_indices, n)
+        end_digits_time = time.time()
+        print(f"{n} digits total jolt: {total_jolt} - time: {end_digits_time - start_digits_time:e} seconds")
 
-    print(f"part 2 total jolt: {total_jolt} - time: {end_part2_time - start_part2_time:e} seconds") 
+    if args.benchmark:
+        benchmark()
@@ -1,9 +1,11 @@
 import argparse
 import itertools
-import os
 import time
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+import instrument
+import render
 
 
 DELTAS = list(itertools.product((-1, 0, 1), repeat=2))
@@ -11,13 +13,11 @@ DELTAS.remove((0, 0))
 
 
 def print_warehouse(warehouse: List[List[str]], removed_roll_count: int):
-    os.system('clear')
-    for row in warehouse:
-        print("".join(row))
+    lines = ["".join(row) for row in warehouse]
     if warehouse and warehouse[0]:
-        print("-" * len(warehouse[0]))
-    print(f"\nRemoved {removed_roll_count} rolls")
-    time.sleep(0.5)
+        lines.append("-" * len(warehouse[0]))
+    lines.extend(["", f"Removed {removed_roll_count} rolls"])
+    render.shared().frame(lines)
 
 
 def parse_input(filename: str) -> Tuple[List[List[str]], List[Tuple[int, int]]]:
@@ -33,6 +33,36 @@ def parse_input(filename: str) -> Tuple[List[List[str]], List[Tuple[int, int]]]:
             
     return warehouse, rolls
 
+def parse_grid(filename: str):
+    '''Loads the warehouse as a 2D boolean NumPy array, True where there's a roll.'''
+    import numpy as np
+
+    with open(filename, 'rb') as f:
+        raw = f.read().rstrip() + b'\n'
+    width = raw.index(b'\n')
+    if len(raw) % (width + 1):
+        raise ValueError(f"{filename}: warehouse rows must all be the same length for --numpy")
+
+    data = np.frombuffer(raw, dtype=np.uint8).reshape(-1, width + 1)
+    # Ragged rows can still add up to a multiple of the first row's length.
+    if not (data[:, width] == ord('\n')).all():
+        raise ValueError(f"{filename}: warehouse rows must all be the same length for --numpy")
+    return data[:, :width] == ord('@')
+
+def neighbour_counts(grid):
+    '''Number of rolls around every cell, adding up the 8 shifted copies of the padded grid.'''
+    import numpy as np
+
+    rows, cols = grid.shape
+    padded = np.pad(grid, 1).astype(np.uint8)
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    for row_delta, col_delta in DELTAS:
+        counts += padded[1 + row_delta:1 + row_delta + rows, 1 + col_delta:1 + col_delta + cols]
+    return counts
+
+def count_accessible_grid(grid) -> int:
+    return int((grid & (neighbour_counts(grid) < 4)).sum())
+
 def count_and_remove_accessible_rolls(warehouse: List[List[str]], rolls: List[Tuple[int, int]]) -> Tuple[int, List[List[str]], List[Tuple[int, int]]]:
     rolls_to_remove = []
     max_row_index = len(warehouse) - 1
@@ -68,10 +98,104 @@ def count_and_remove_accessible_rolls(warehouse: List[List[str]], rolls: List[Tu
     return len(rolls_to_remove), warehouse, new_rolls
 
 
+def part2(warehouse: List[List[str]], rolls: List[Tuple[int, int]], visualise: bool = False) -> int:
+    original_roll_count = len(rolls)
+    previous_roll_count = original_roll_count
+    step = 0
+    while True:
+        step += 1
+        removed_roll_count, warehouse, rolls = count_and_remove_accessible_rolls(warehouse, rolls)
+        
+        if len(rolls) == previous_roll_count:
+            break
+        
+        if visualise:
+            print_warehouse(warehouse, removed_roll_count)
+
+        previous_roll_count = len(rolls)
+
+    return original_roll_count - len(rolls)
+
+
+def part2_grid(grid, visualise: bool = False) -> int:
+    '''part2() on a parse_grid() array, removing each round's accessible rolls at once.'''
+    removed_roll_count = 0
+    while True:
+        accessible = grid & (neighbour_counts(grid) < 4)
+        round_count = int(accessible.sum())
+        if not round_count:
+            break
+        grid &= ~accessible
+        removed_roll_count += round_count
+
+        if visualise:
+            print_warehouse([['@' if roll else '.' for roll in row] for row in grid.tolist()], round_count)
+
+    return removed_roll_count
+
+
+def _roll_neighbour_counts(rolls: List[Tuple[int, int]]) -> Dict[Tuple[int, int], int]:
+    roll_set = set(rolls)
+    return {
+        (row_index, col_index): sum((row_index + row_delta, col_index + col_delta) in roll_set for row_delta, col_delta in DELTAS)
+        for row_index, col_index in rolls
+    }
+
+
+def count_accessible_rolls(rolls: List[Tuple[int, int]]) -> int:
+    '''Part 1 for the worklist solver: the rolls peel_rolls() would remove in its first round.'''
+    return sum(count < 4 for count in _roll_neighbour_counts(rolls).values())
+
+
+def peel_rolls(rolls: List[Tuple[int, int]]) -> List[List[Tuple[int, int]]]:
+    '''
+    Same rounds as calling count_and_remove_accessible_rolls() until nothing
+    changes, returning the rolls removed in each round, but each roll's
+    neighbour count is only worked out once. Removing a roll decrements its
+    neighbours' counts, and a neighbour whose count drops below 4 is removed in
+    the next round, so only rolls next to removed ones are ever looked at again.
+    '''
+    remaining = set(rolls)
+    neighbour_counts = _roll_neighbour_counts(rolls)
+
+    rounds = []
+    removable = [roll for roll in rolls if neighbour_counts[roll] < 4]
+    while removable:
+        rounds.append(removable)
+        remaining.difference_update(removable)
+        next_removable = []
+        for row_index, col_index in removable:
+            for row_delta, col_delta in DELTAS:
+                neighbour = (row_index + row_delta, col_index + col_delta)
+                if neighbour not in remaining:
+                    continue
+                neighbour_counts[neighbour] -= 1
+                # Counts only go down, so this is true exactly once per roll.
+                if neighbour_counts[neighbour] == 3:
+                    next_removable.append(neighbour)
+        removable = next_removable
+
+    return rounds
+
+
+def part2_worklist(warehouse: List[List[str]], rolls: List[Tuple[int, int]], visualise: bool = False) -> int:
+    rounds = peel_rolls(rolls)
+    if visualise:
+        for removed in rounds:
+            for row_index, col_index in removed:
+                warehouse[row_index][col_index] = '.'
+            print_warehouse(warehouse, len(removed))
+
+    return sum(len(removed) for removed in rounds)
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--visualise', action='store_true', help="Show visualisation for part 2.")
+    parser.add_argument('--numpy', action='store_true', help="Count neighbours for the whole grid at once with NumPy.")
+    parser.add_argument('--worklist', action='store_true', help="Only revisit the neighbours of removed rolls instead of rescanning every round.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
 
     warehouse, rolls = parse_input(args.filename)
@@ -79,7 +203,12 @@ if __name__ == '__main__':
     part1_start_time = time.time()
     # Run part 1 on a copy of the warehouse to show visualization without affecting the original variable before re-parsing
     p1_warehouse = [row[:] for row in warehouse]
-    accessible_roll_count, p1_warehouse, _ = count_and_remove_accessible_rolls(p1_warehouse, rolls)
+    if args.numpy:
+        accessible_roll_count = instrument.run(args, 'part 1', count_accessible_grid, parse_grid(args.filename))
+    elif args.worklist:
+        accessible_roll_count = instrument.run(args, 'part 1', count_accessible_rolls, rolls)
+    else:
+        accessible_roll_count, p1_warehouse, _ = instrument.run(args, 'part 1', count_and_remove_accessible_rolls, p1_warehouse, rolls)
     part1_end_time = time.time()
 
     print(f"part 1 accessible rolls: {accessible_roll_count} - time taken: {part1_end_time - part1_start_time:e}")
@@ -87,25 +216,17 @@ if __name__ == '__main__':
     ###################
 
     warehouse, rolls = parse_input(args.filename)
-    original_roll_count = len(rolls)
     if args.visualise:
-        print("\nStarting Part 2. Initial state:")
         print_warehouse(warehouse, 0)
 
     part2_start_time = time.time()
-    previous_roll_count = original_roll_count
-    step = 0
-    while True:
-        step += 1
-        removed_roll_count, warehouse, rolls = count_and_remove_accessible_rolls(warehouse, rolls)
-        
-        if len(rolls) == previous_roll_count:
-            break
-        
-        if args.visualise:
-            print_warehouse(warehouse, removed_roll_count)
-
-        previous_roll_count = len(rolls)
+    if args.numpy:
+        removed_roll_count = instrument.run(args, 'part 2', part2_grid, parse_grid(args.filename), visualise=args.visualise)
+    else:
+        part2_solver = part2_worklist if args.worklist else part2
+        removed_roll_count = instrument.run(args, 'part 2', part2_solver, warehouse, rolls, visualise=args.visualise)
     part2_end_time = time.time()
-    
-    print(f"part 2 - removed rolls: {original_roll_count - len(rolls)} - time taken: {part2_end_time - part2_start_time:e}")
+    if args.visualise:
+        render.close_shared()
+
+    print(f"part 2 - removed rolls: {removed_roll_count} - time taken: {part2_end_time - part2_start_time:e}")
@@ -1,8 +1,13 @@
 import argparse
 import bisect
+import os
+import stat
+import sys
 import time
 
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import instrument
 
 
 def parse_inventory(filename: str) -> Tuple[List[List[int]], List[int]]:
@@ -24,6 +29,38 @@ def parse_inventory(filename: str) -> Tuple[List[List[int]], List[int]]:
     return fresh_ranges, ingredients
 
 
+def parse_fresh_ranges(filename: str) -> List[List[int]]:
+    """Reads just the fresh ranges, stopping at the blank line before the ingredients."""
+    fresh_ranges = []
+    with open(filename, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                break
+            start, stop = line.split("-")
+            fresh_ranges.append([int(start), int(stop)])
+
+    return fresh_ranges
+
+
+def parse_inventory_arrays(filename: str):
+    """
+    Like parse_inventory() but the ingredients come back as a NumPy int64 array,
+    converted in one go rather than one int() per line.
+    """
+    import numpy as np
+
+    with open(filename, "rb") as f:
+        ranges_section, _, ingredients_section = f.read().partition(b"\n\n")
+
+    fresh_ranges = []
+    for line in ranges_section.split():
+        start, stop = line.split(b"-")
+        fresh_ranges.append([int(start), int(stop)])
+
+    return fresh_ranges, np.array(ingredients_section.split(), dtype=np.int64)
+
+
 def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
     ranges.sort(key=lambda x: x[0])
     merged_ranges = [ranges[0]]
@@ -37,12 +74,90 @@ def merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
     return merged_ranges
 
 
+class IntervalSet(object):
+    """
+    Sorted, disjoint inclusive ranges that can be changed as ranges are added
+    or retired, instead of re-merging everything with merge_ranges().
+
+    Starts and stops are kept in two sorted lists so the ranges touched by an
+    add or discard, and the range a point could be in, are found with bisect.
+    `covered` is the number of IDs in all the ranges, kept up to date as
+    ranges change.
+
+    Membership is O(log n), but add and discard are only O(log n) to find the
+    ranges to change: replacing them is a list slice assignment, which shifts
+    the rest of the list and so is O(n). That's a memmove of pointers, cheap
+    for the thousands of ranges we have. A balanced tree would make updates
+    O(log n) if that stops being true.
+    """
+
+    def __init__(self, ranges: Iterable[List[int]] = ()):
+        self._starts = []
+        self._stops = []
+        self.covered = 0
+        for start, stop in ranges:
+            self.add(start, stop)
+
+    def add(self, start: int, stop: int):
+        # Ranges that overlap or touch [start, stop] are merged with it.
+        lo = bisect.bisect_left(self._stops, start - 1)
+        hi = bisect.bisect_right(self._starts, stop + 1)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            stop = max(stop, self._stops[hi - 1])
+            self.covered -= self._covered_between(lo, hi)
+        self._starts[lo:hi] = [start]
+        self._stops[lo:hi] = [stop]
+        self.covered += stop - start + 1
+
+    def discard(self, start: int, stop: int):
+        lo = bisect.bisect_left(self._stops, start)
+        hi = bisect.bisect_right(self._starts, stop)
+        if lo >= hi:
+            return
+        # The first and last ranges touched may stick out either side of [start, stop].
+        new_starts = []
+        new_stops = []
+        if self._starts[lo] < start:
+            new_starts.append(self._starts[lo])
+            new_stops.append(start - 1)
+        if self._stops[hi - 1] > stop:
+            new_starts.append(stop + 1)
+            new_stops.append(self._stops[hi - 1])
+        self.covered -= self._covered_between(lo, hi)
+        self.covered += sum(b - a + 1 for a, b in zip(new_starts, new_stops))
+        self._starts[lo:hi] = new_starts
+        self._stops[lo:hi] = new_stops
+
+    def _covered_between(self, lo: int, hi: int) -> int:
+        return sum(self._stops[i] - self._starts[i] + 1 for i in range(lo, hi))
+
+    def __contains__(self, ingredient: int) -> bool:
+        idx = bisect.bisect_right(self._starts, ingredient)
+        return idx > 0 and ingredient <= self._stops[idx - 1]
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for start, stop in zip(self._starts, self._stops):
+            yield [start, stop]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
 def fresh_or_spoiled(
-    fresh_ranges: List[List[int]], ingredients: List[int]
+    fresh_ranges: Union[List[List[int]], IntervalSet], ingredients: List[int]
 ) -> Tuple[List[int], List[int]]:
     fresh = []
     spoiled = []
 
+    if isinstance(fresh_ranges, IntervalSet):
+        for ingredient in ingredients:
+            if ingredient in fresh_ranges:
+                fresh.append(ingredient)
+            else:
+                spoiled.append(ingredient)
+        return fresh, spoiled
+
     # fresh_ranges is already sorted by start from merge_ranges
     range_starts = [r[0] for r in fresh_ranges]
 
@@ -67,37 +182,196 @@ def fresh_or_spoiled(
     return fresh, spoiled
 
 
-def count_all_possible_fresh_ingredients(fresh_ranges: List[List[int]]) -> int:
+def fresh_mask(fresh_ranges: List[List[int]], ingredients):
+    """
+    Bulk version of fresh_or_spoiled(), returning a boolean array that's True
+    for the fresh ingredients. One searchsorted finds each ingredient's
+    candidate range, as bisect_right does above, and the bounds check is done
+    for every ingredient at once.
+    """
+    import numpy as np
+
+    ingredients = np.asarray(ingredients, dtype=np.int64)
+    range_starts = np.array([r[0] for r in fresh_ranges], dtype=np.int64)
+    range_stops = np.array([r[1] for r in fresh_ranges], dtype=np.int64)
+
+    idx = np.searchsorted(range_starts, ingredients, side="right") - 1
+    # idx is -1 for ingredients before the first range, which are spoiled.
+    return (idx >= 0) & (ingredients <= range_stops[np.maximum(idx, 0)])
+
+
+def count_all_possible_fresh_ingredients(
+    fresh_ranges: Union[List[List[int]], IntervalSet]
+) -> int:
+    if isinstance(fresh_ranges, IntervalSet):
+        return fresh_ranges.covered
+
     count = 0
     for start, stop in fresh_ranges:
         count += stop - start + 1
     return count
 
 
+def _answer_query(fresh_ranges: IntervalSet, line: bytes) -> str:
+    # Undecodable bytes can't make a valid ID either, so they're reported as invalid below.
+    query = line.strip().decode(errors="replace")
+    try:
+        ingredient = int(query)
+    except ValueError:
+        return f"{query} invalid"
+    return f"{ingredient} {'fresh' if ingredient in fresh_ranges else 'spoiled'}"
+
+
+def serve_queries(
+    fresh_ranges: IntervalSet, read, write, chunk_size: int = 1 << 16
+) -> int:
+    """
+    Answers ingredient IDs, one per line, with "<id> fresh" or "<id> spoiled"
+    lines until `read` returns nothing, and returns the number of queries.
+
+    `read(n)` returns whatever is available up to n bytes (eg: os.read on stdin
+    or a socket's recv), and every complete line in it is answered with a single
+    `write`, so a producer sending many IDs at once gets them back in one batch.
+    A partial line at the end of a chunk waits for the rest of it.
+    """
+    answered = 0
+    pending = b""
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        answers = [_answer_query(fresh_ranges, line) for line in lines if line.strip()]
+        if answers:
+            write(("\n".join(answers) + "\n").encode())
+            answered += len(answers)
+
+    if pending.strip():
+        write((_answer_query(fresh_ranges, pending) + "\n").encode())
+        answered += 1
+    return answered
+
+
+def serve_stdin(fresh_ranges: IntervalSet) -> int:
+    def write(data: bytes):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    return serve_queries(
+        fresh_ranges, lambda n: os.read(sys.stdin.fileno(), n), write
+    )
+
+
+def serve_socket(fresh_ranges: IntervalSet, path: str):
+    """
+    Serves queries on a Unix socket at `path`, one connection at a time, until
+    interrupted. A socket left at `path` by an earlier run is replaced, but
+    anything else there is left alone.
+    """
+    import socket
+
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{path} already exists and isn't a socket")
+        os.unlink(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(path)
+        server.listen()
+        print(f"serving on {path}", file=sys.stderr)
+        try:
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    # A client going away mid-batch shouldn't stop the server.
+                    try:
+                        serve_queries(fresh_ranges, connection.recv, connection.sendall)
+                    except OSError as e:
+                        print(f"dropped connection: {e}", file=sys.stderr)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", help="The input file with battery banks.")
     parser.add_argument(
         "--visualise", action="store_true", help="Show visualisation for part 2."
     )
+    parser.add_argument(
+        "--numpy",
+        action="store_true",
+        help="Classify all the ingredients at once with NumPy.",
+    )
+    parser.add_argument(
+        "--interval-set",
+        action="store_true",
+        help="Keep the fresh ranges in an IntervalSet instead of a merged list.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Only load the fresh ranges, then answer ingredient IDs read from stdin.",
+    )
+    parser.add_argument(
+        "--socket", help="With --serve, answer queries on this Unix socket instead."
+    )
+    instrument.add_arguments(parser)
     args = parser.parse_args()
 
-    fresh_ranges, ingredients = parse_inventory(args.filename)
+    if args.serve:
+        fresh_ranges = IntervalSet(parse_fresh_ranges(args.filename))
+        if args.socket:
+            try:
+                serve_socket(fresh_ranges, args.socket)
+            except FileExistsError as e:
+                parser.error(str(e))
+        else:
+            serve_stdin(fresh_ranges)
+        sys.exit(0)
+
+    if args.numpy:
+        fresh_ranges, ingredients = parse_inventory_arrays(args.filename)
+    else:
+        fresh_ranges, ingredients = parse_inventory(args.filename)
 
     part1_start_time = time.time()
-    merged_fresh_ranges = merge_ranges(fresh_ranges)
-    fresh, spoiled = fresh_or_spoiled(merged_fresh_ranges, ingredients)
+    if args.interval_set:
+        merged_fresh_ranges = instrument.run(
+            args, "merge ranges", IntervalSet, fresh_ranges
+        )
+    else:
+        merged_fresh_ranges = instrument.run(
+            args, "merge ranges", merge_ranges, fresh_ranges
+        )
+    if args.numpy:
+        fresh_count = int(
+            instrument.run(
+                args, "part 1", fresh_mask, merged_fresh_ranges, ingredients
+            ).sum()
+        )
+    else:
+        fresh, spoiled = instrument.run(
+            args, "part 1", fresh_or_spoiled, merged_fresh_ranges, ingredients
+        )
+        fresh_count = len(fresh)
     part1_end_time = time.time()
 
     print(
-        f"count of fresh ingredients: {len(fresh)} - time: {part1_end_time - part1_start_time:e}"
+        f"count of fresh ingredients: {fresh_count} - time: {part1_end_time - part1_start_time:e}"
     )
 
     ###################
 
     part2_start_time = time.time()
-    total_possible_fresh_count = count_all_possible_fresh_ingredients(
-        merged_fresh_ranges
+    total_possible_fresh_count = instrument.run(
+        args, "part 2", count_all_possible_fresh_ingredients, merged_fresh_ranges
     )
     part2_end_time = time.time()
 
@@ -1,8 +1,11 @@
 import argparse
 import functools
+import mmap
 import time
 
-from typing import List, Union
+from typing import Iterator, List, Union
+
+import instrument
 
 
 def part1(filename: str) -> List[List[Union[str, int]]]:
@@ -70,16 +73,171 @@ def part2(filename: str) -> List[int]:
     return answers
 
 
+def part1_streaming(filename: str) -> List[List[Union[str, int]]]:
+    '''
+    Same answers as part1() reading forwards one line at a time, as suggested
+    above: each column keeps both a running sum and a running product, and
+    the operator line at the end picks which one is the answer. Only the
+    accumulators are kept, so memory depends on the number of columns, not
+    the number of lines.
+    '''
+    sums = None
+    products = None
+    with open(filename, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            if fields[0] in ('+', '*'):
+                return [[op, sums[idx] if op == '+' else products[idx]] for idx, op in enumerate(fields)]
+
+            numbers = [int(number) for number in fields]
+            if sums is None:
+                sums = numbers
+                products = list(numbers)
+            else:
+                for idx, number in enumerate(numbers):
+                    sums[idx] += number
+                    products[idx] *= number
+
+    raise ValueError(f"{filename} has no operator line")
+
+
+def _combine_columns(operator_line: str, column_numbers: List[int], column_has_digits: List[bool]) -> List[int]:
+    '''
+    Works out part 2's answers from each character column's number: a problem
+    starts at its operator and runs until a column without any digits.
+    '''
+    answers = []
+    answer = None
+    for col_idx, has_digits in enumerate(column_has_digits):
+        if col_idx < len(operator_line) and operator_line[col_idx] in ('+', '*'):
+            operator = operator_line[col_idx]
+            answer = 0 if operator == '+' else 1
+        if not has_digits:
+            if answer is not None:
+                answers.append(answer)
+            answer = None
+        elif operator == '+':
+            answer += column_numbers[col_idx]
+        else:
+            answer *= column_numbers[col_idx]
+    if answer is not None:
+        answers.append(answer)
+
+    return answers
+
+
+def part2_streaming(filename: str) -> List[int]:
+    '''
+    Same answers as part2() without building the columns. Every character
+    column accumulates its number digit by digit as the lines go by, and
+    remembers whether it had any digits at all, since an empty column
+    separates problems. The operator line then says where each problem
+    starts and how to combine its columns' numbers.
+    '''
+    column_numbers = []
+    column_has_digits = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line.lstrip()[:1] in ('+', '*'):
+                break
+            if len(line) > len(column_numbers):
+                column_numbers.extend([0] * (len(line) - len(column_numbers)))
+                column_has_digits.extend([False] * (len(line) - len(column_has_digits)))
+            for col_idx, c in enumerate(line):
+                if c != ' ':
+                    column_numbers[col_idx] = column_numbers[col_idx] * 10 + int(c)
+                    column_has_digits[col_idx] = True
+        else:
+            raise ValueError(f"{filename} has no operator line")
+
+    return _combine_columns(line, column_numbers, column_has_digits)
+
+
+def reverse_lines(buffer: mmap.mmap) -> Iterator[bytes]:
+    '''
+    Yields the lines of a memory mapped file from last to first, without
+    their newlines, skipping blank lines. Only the pages holding the lines
+    actually read are loaded, so the operator line at the end can be read
+    without touching the rest of the file.
+    '''
+    end = len(buffer)
+    while end > 0:
+        start = buffer.rfind(b'\n', 0, end) + 1
+        line = buffer[start:end]
+        if line.strip():
+            yield line
+        end = start - 1
+
+
+def part1_mmap(filename: str) -> List[List[Union[str, int]]]:
+    '''
+    part1() done properly: the operators are read from the end of the memory
+    mapped file and the numbers walked backwards from there, keeping just a
+    running total per column.
+    '''
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        lines = reverse_lines(buffer)
+        answers = [[op, None] for op in next(lines).decode().split()]
+        for line in lines:
+            for idx, number in enumerate(line.split()):
+                answer = answers[idx]
+                if answer[1] is None:
+                    answer[1] = int(number)
+                elif answer[0] == '+':
+                    answer[1] += int(number)
+                else:
+                    answer[1] *= int(number)
+
+    return answers
+
+
+def part2_mmap(filename: str) -> List[int]:
+    '''
+    part2() reading the memory mapped file backwards like part1_mmap(). As
+    the lines go from the bottom up, each character column's digits come
+    least significant first, so each column keeps a place multiplier that
+    goes up by 10 for every digit it gets.
+    '''
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        lines = reverse_lines(buffer)
+        operator_line = next(lines).decode()
+        column_numbers = []
+        places = []
+        for line in lines:
+            if len(line) > len(column_numbers):
+                column_numbers.extend([0] * (len(line) - len(column_numbers)))
+                places.extend([1] * (len(line) - len(places)))
+            for col_idx, c in enumerate(line):
+                if c != ord(' '):
+                    column_numbers[col_idx] += (c - ord('0')) * places[col_idx]
+                    places[col_idx] *= 10
+
+    return _combine_columns(operator_line, column_numbers, [place > 1 for place in places])
+
+
+ENGINES = {
+    'readlines': (part1, part2),
+    'streaming': (part1_streaming, part2_streaming),
+    'mmap': (part1_mmap, part2_mmap),
+}
+
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", help="The input file with battery banks.")
     parser.add_argument(
         "--visualise", action="store_true", help="Show visualisation for part 2."
     )
+    parser.add_argument('--engine', choices=list(ENGINES), default='readlines', help="How to read the worksheet.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    part1_solver, part2_solver = ENGINES[args.engine]
 
     part1_start_time = time.time()
-    answers = part1(args.filename)
+    answers = instrument.run(args, 'part 1', part1_solver, args.filename)
     answer = functools.reduce(lambda x, y: x + y[1], answers, 0) 
     part1_end_time = time.time()
 
@@ -88,7 +246,7 @@ if __name__ == '__main__':
     #######################
 
     part2_start_time = time.time()
-    answers = sum(part2(args.filename))
+    answers = sum(instrument.run(args, 'part 2', part2_solver, args.filename))
     part2_end_time = time.time()
 
     print(f"part 2 answer: {answers} - time: {part2_end_time - part2_start_time:e}")
\ No newline at end of file
@@ -4,6 +4,8 @@ import time
 
 from typing import List, Tuple, Union
 
+import instrument
+
 
 def parse_manifold(filename: str) -> List[str]:
     manifold = []
@@ -100,11 +102,12 @@ if __name__ == '__main__':
     parser.add_argument(
         "--visualise", action="store_true", help="Show visualisation for part 2."
     )
+    instrument.add_arguments(parser)
     args = parser.parse_args()
 
     part1_start = time.time()
     manifold = parse_manifold(args.filename)
-    beam_plot, split_count = plot_classical_beam(manifold)
+    beam_plot, split_count = instrument.run(args, 'part 1', plot_classical_beam, manifold)
     part1_end = time.time()
 
     print(f"part1 answer: {split_count} - time: {part1_end - part1_start:e}")
@@ -113,10 +116,10 @@ if __name__ == '__main__':
 
     part2_start = time.time()
     if args.visualise:
-        timeline_count, history = count_quantum_timelines(beam_plot, get_history=True)
+        timeline_count, history = instrument.run(args, 'part 2', count_quantum_timelines, beam_plot, get_history=True)
         visualize_timeline_evolution(beam_plot, history, timeline_count)
     else:
-        timeline_count = count_quantum_timelines(beam_plot)
+        timeline_count = instrument.run(args, 'part 2', count_quantum_timelines, beam_plot)
     part2_end = time.time()
 
     print(f"part2 answer: {timeline_count} - time: {part2_end - part2_start:e}")
\ No newline at end of file
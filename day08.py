@@ -6,6 +6,8 @@ import time
 
 from typing import Dict, List, Set, Tuple
 
+import instrument
+
 JBox = Tuple[int, int, int]
 JBoxDict = Dict[JBox, List[JBox]]
 
@@ -96,13 +98,14 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--connections', help="The number of junction box connections to make.", default=10, type=int)
+    instrument.add_arguments(parser)
     args = parser.parse_args()
 
     jboxes = create_jboxes_from_input(args.filename)
 
     part1_start_time = time.time()
-    jbox_pairs_by_distance = create_jbox_pairs_by_distance(jboxes)
-    connected_jboxes, _ = connect_nearest_n_jboxes(jboxes, jbox_pairs_by_distance, args.connections)
+    jbox_pairs_by_distance = instrument.run(args, 'pairs by distance', create_jbox_pairs_by_distance, jboxes)
+    connected_jboxes, _ = instrument.run(args, 'part 1', connect_nearest_n_jboxes, jboxes, jbox_pairs_by_distance, args.connections)
     circuit_count = count_circuits(connected_jboxes)
     part1_end_time = time.time()
 
@@ -111,7 +114,7 @@ if __name__ == '__main__':
     ######################
 
     part2_start_time = time.time()
-    last_connected_pair = connect_until_single_circuit(jboxes, jbox_pairs_by_distance)
+    last_connected_pair = instrument.run(args, 'part 2', connect_until_single_circuit, jboxes, jbox_pairs_by_distance)
     part2_end_time = time.time()
 
     print(f"part 2 answer: {last_connected_pair[0][0] * last_connected_pair[1][0]} - time: {part2_end_time - part2_start_time:e} seconds")
\ No newline at end of file
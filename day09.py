@@ -8,6 +8,9 @@ import time
 
 from typing import List, Tuple, Dict, Set
 
+import instrument
+import progress
+
 
 def parse_input(filename: str) -> List[Tuple[int, int]]:
     tiles = []
@@ -117,9 +120,9 @@ def max_area_only_green(red_tiles: List[Tuple[int, int]], red_and_green_tiles: L
     # cover larger squars and so create a new max.
     corners_to_check = list(itertools.combinations(red_tiles, 2))
     corners_to_check = sorted(corners_to_check, key=lambda corners: math.dist(corners[0], corners[1]), reverse=True)
+    reporter = progress.Progress(len(corners_to_check), 'corner pairs')
     for idx, corners in enumerate(corners_to_check):
-        if idx % 1000 == 0:
-            print(f"{idx}/{len(corners_to_check)}")
+        reporter.update(idx)
 
         area = _area(corners)
         if area > max_area:            
@@ -164,9 +167,9 @@ def max_area_only_green2(red_tiles: List[Tuple[int, int]], red_and_green_ranges:
     # cover larger squars and so create a new max.
     corners_to_check = list(itertools.combinations(red_tiles, 2))
     corners_to_check = sorted(corners_to_check, key=lambda corners: math.dist(corners[0], corners[1]), reverse=True)
+    reporter = progress.Progress(len(corners_to_check), 'corner pairs')
     for idx, corners in enumerate(corners_to_check):
-        if idx % 1000 == 0:
-            print(f"{idx}/{len(corners_to_check)}")
+        reporter.update(idx)
 
         area = _area(corners)
         if area > max_area:            
@@ -182,12 +185,15 @@ if __name__ == "__main__":
     parser.add_argument(
         "--visualise", action="store_true", help="Show visualisation for part 2."
     )
+    parser.add_argument("--quiet", action="store_true", help="Don't report progress.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    progress.set_quiet(args.quiet)
 
     red_tiles = parse_input(args.filename)
 
     part1_start_time = time.time()
-    max_area = max_area(red_tiles)
+    max_area = instrument.run(args, 'part 1', max_area, red_tiles)
     part1_end_time = time.time()
 
     print(f"part 1 answer: {max_area} - time: {part1_end_time - part1_start_time:e} seconds")
@@ -195,13 +201,13 @@ if __name__ == "__main__":
     ###################
 
     part2_start_time = time.time()
-    red_and_all_green_tiles = red_and_green_edge_tiles(red_tiles)
+    red_and_all_green_tiles = instrument.run(args, 'edge tiles', red_and_green_edge_tiles, red_tiles)
     # Currently the fastest method.
     # Other methods implemented that are slower:
     #   max_area_only_green2(red_tiles, red_and_green_ranges): operates on ranges on their overlaps
     #   square_contains_red_or_green_tile_optimized() called from 
     #   that attempts to prune the range of tiles to check against.
-    max_area = max_area_only_green(red_tiles, red_and_all_green_tiles)
+    max_area = instrument.run(args, 'part 2', max_area_only_green, red_tiles, red_and_all_green_tiles)
     #red_and_green_ranges = red_and_green_full_ranges(red_and_all_green_tiles)
     #max_area = max_area_only_green(red_tiles, red_and_all_green_tiles)
     part2_end_time = time.time()
@@ -1,11 +1,13 @@
 import argparse
 import copy
 import itertools
-import scipy
 import time
 
 from typing import List, Tuple
 
+import instrument
+import progress
+
 class Machine(object):
     def __init__(self, lights, buttons, jolts):
         self.lights = self.bitmap_int_from_bitmap_list(lights)
@@ -108,8 +110,9 @@ def part2(machines: List[Machine]) -> int:
     button_press_count_sum = 0
 
     machine_idx = 1
+    reporter = progress.Progress(len(machines), 'machines')
     for machine in machines:
-        print(f"{machine_idx}/{len(machines)}")
+        reporter.update(machine_idx)
         # Need at least as many button presses as the max jolt value to sum to the max jolt value.
         button_presses = max(machine.jolts)
         solved = False
@@ -127,7 +130,7 @@ def part2(machines: List[Machine]) -> int:
     return button_press_count_sum
 
 def _recurse_part2a(buttons: List[int], all_buttons: List[List[int]], jolts: List[int], target_jolts: List[int]):
-    print(f"buttons: {buttons}, jolts: {jolts}, target_jolts: {target_jolts}")
+    progress.log(f"buttons: {buttons}, jolts: {jolts}, target_jolts: {target_jolts}")
     _jolts = copy.deepcopy(jolts)
     for button in buttons:
         _jolts[button] += 1
@@ -135,13 +138,13 @@ def _recurse_part2a(buttons: List[int], all_buttons: List[List[int]], jolts: Lis
     if _jolts == target_jolts:
         return 1
     if any(j > tj for j, tj in zip(_jolts, target_jolts)):
-        print(f"FAILED: jolts: {_jolts}, target_jolts: {target_jolts}")
+        progress.log(f"FAILED: jolts: {_jolts}, target_jolts: {target_jolts}")
         return None
     
     for buttons in all_buttons:
         result = _recurse_part2a(buttons, all_buttons, _jolts, target_jolts)
         if result:
-            print(f"result: {result}")
+            progress.log(f"result: {result}")
             return result+1
 
 def _bfs_part2a(all_buttons: List[List[int]], target_jolts: List[int]):
@@ -169,7 +172,7 @@ def _bfs_part2a(all_buttons: List[List[int]], target_jolts: List[int]):
                 #print(f"new_branches: {new_branches}")
         branches = new_branches
         button_press_count += 1
-        print(f"button_press_count: {button_press_count}")
+        progress.log(f"button_press_count: {button_press_count}")
         
        
     return button_press_count
@@ -204,12 +207,18 @@ def part2_linprog(machines: List[Machine]) -> int:
        (0, None) for each button count, or ((0, None), (0, None)) in our example.
     4. We feed the above into scipy.optimize.linprod, setting `integrality=1` becase
        we only want integer solutions.
+
+    scipy is imported here rather than at the top of the file since importing it
+    takes far longer than running part1.
     '''
+    import scipy.optimize
+
     button_press_count_sum = 0
 
     machine_idx = 1
+    reporter = progress.Progress(len(machines), 'machines')
     for machine in machines:
-        print(f"{machine_idx}/{len(machines)}")
+        reporter.update(machine_idx)
 
         A = []
         for jolt_idx, _ in enumerate(machine.jolts):
@@ -220,7 +229,8 @@ def part2_linprog(machines: List[Machine]) -> int:
 
         res=scipy.optimize.linprog(c, A_eq=A, b_eq=b, bounds=bounds, integrality=1)
 
-        print(f"res: {res.x}")
+        if reporter.due():
+            reporter.update(machine_idx, f"res: {res.x}")
 
         button_press_count_sum += int(sum(res.x))
 
@@ -234,14 +244,17 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--visualise', action='store_true', help="Show visualisation for part 2.")
+    parser.add_argument('--quiet', action='store_true', help="Don't report progress.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    progress.set_quiet(args.quiet)
 
     machines = parse_input(args.filename)
     for machine in machines:
-        print(machine)
+        progress.log(str(machine))
 
     part1_start_time = time.time()
-    answer = part1(machines)
+    answer = instrument.run(args, 'part 1', part1, machines)
     part1_end_time = time.time()
 
     print(f"part 1 answer: {answer} - time: {part1_end_time - part1_start_time:e} seconds")
@@ -249,7 +262,7 @@ if __name__ == '__main__':
     ###################
 
     part2_start_time = time.time()
-    answer = part2_linprog(machines)
+    answer = instrument.run(args, 'part 2', part2_linprog, machines)
     part2_end_time = time.time()
 
     print(f"part 2 answer: {answer} - time: {part2_end_time - part2_start_time:e} seconds")
\ No newline at end of file
@@ -4,6 +4,9 @@ import time
 
 from typing import List, Tuple, Dict
 
+import instrument
+import progress
+
 def parse_input(filename: str) -> Dict[str, List[str]]:
     nodes = {}
     with open(filename, 'r') as f:
@@ -45,11 +48,11 @@ def part2(nodes: Dict[str, List[str]]) -> int:
         return path_count
     
     svr_to_fft_count = _recurse('svr', 'fft', ('out', 'dac'))
-    print(f"svr_to_fft_count: {svr_to_fft_count}")
+    progress.log(f"svr_to_fft_count: {svr_to_fft_count}")
     fft_to_dac_count = _recurse('fft', 'dac', ('out', 'svr'))
-    print(f"fft_to_dac_count: {fft_to_dac_count}")
+    progress.log(f"fft_to_dac_count: {fft_to_dac_count}")
     dac_to_out_count = _recurse('dac', 'out', ('fft', 'svr'))
-    print(f"dac_to_out_count: {dac_to_out_count}")
+    progress.log(f"dac_to_out_count: {dac_to_out_count}")
 
     return svr_to_fft_count * fft_to_dac_count * dac_to_out_count
 
@@ -58,15 +61,18 @@ if __name__ == '__main__':
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--part', help="Which part to run, default to both.", default=0, type=int)
     parser.add_argument('--visualise', action='store_true', help="Show visualisation for part 2.")
+    parser.add_argument('--quiet', action='store_true', help="Don't report progress.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    progress.set_quiet(args.quiet)
 
     nodes = parse_input(args.filename)
     for node in nodes.items():
-        print(node)
+        progress.log(str(node))
 
     if args.part in (0, 1):
         part1_start_time = time.time()
-        answer = part1(nodes)
+        answer = instrument.run(args, 'part 1', part1, nodes)
         part1_end_time = time.time()
 
         print(f"part 1 answer: {answer} - time: {part1_end_time - part1_start_time:e} seconds")
@@ -75,7 +81,7 @@ if __name__ == '__main__':
 
     if args.part in (0, 2):
         part2_start_time = time.time()
-        answer = part2(nodes)
+        answer = instrument.run(args, 'part 2', part2, nodes)
         part2_end_time = time.time()
 
         print(f"part 2 answer: {answer} - time: {part2_end_time - part2_start_time:e} seconds")
\ No newline at end of file
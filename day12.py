@@ -8,6 +8,9 @@ TREE_RE = r'\d+x\d+\:((\ \d+)+)'
 
 from typing import List, Tuple, Dict
 
+import instrument
+import progress
+
 
 
 def parse_input(filename: str) -> Tuple[List[List[str]], List[Tuple[List[int], List[int]]]]:
@@ -87,13 +90,14 @@ def shape_fits_at_square(shape: List[List[str]], grid: List[List[str]], start_ro
 
 
 
-def part1(all_translated_shapes: Dict[List[List[str]]], trees: List[Tuple[List[int], List[int]]]) -> int:
+def part1(all_translated_shapes: Dict[int, List[List[List[str]]]], trees: List[Tuple[List[int], List[int]]]) -> int:
     '''
     Does not work on test input
     '''
     success_counter = 0
+    reporter = progress.Progress(len(trees), 'trees')
     for tree_idx, tree in enumerate(trees):
-        print(f"tree {tree_idx}/{len(trees)}")
+        reporter.update(tree_idx)
         
         width, depth = tree[0]
         grid = [['.' for _ in range(width)] for _ in range(depth)]
@@ -143,7 +147,7 @@ def part1_trivial(shapes, trees):
         area_available = tree[0][0] * tree[0][1]
         presents = tree[1]
         area_needed = sum(presents) * 9
-        print(f"area_available: {area_available}, area_needed: {area_needed}")
+        progress.log(f"area_available: {area_available}, area_needed: {area_needed}")
         if area_needed <= area_available:
             succeess_counter += 1
 
@@ -153,12 +157,15 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('filename', help="The input file with battery banks.")
     parser.add_argument('--visualise', action='store_true', help="Show visualisation for part 2.")
+    parser.add_argument('--quiet', action='store_true', help="Don't report progress.")
+    instrument.add_arguments(parser)
     args = parser.parse_args()
+    progress.set_quiet(args.quiet)
 
     shapes, trees = parse_input(args.filename)
     all_translated_shapes = all_translated_shapes(shapes)
 
     part1_start_time = time.time()
-    answer = part1(all_translated_shapes, trees)
+    answer = instrument.run(args, 'part 1', part1, all_translated_shapes, trees)
     part1_end_time = time.time()
     print(f"part 1 answer: {answer} - time: {part1_end_time - part1_start_time:e} seconds")
\ No newline at end of file
@@ -0,0 +1,238 @@
+'''
+Seeded generators for synthetic puzzle inputs.
+
+Each generator takes a size and a `random.Random` and returns the input file
+contents for that day. Sizes are in the natural unit of each puzzle (moves,
+ranges, banks, grid side, ...) and BASE_SIZES holds roughly the size of the
+bundled puzzle inputs, so `BASE_SIZES[day] * 100` is a 100x stress input.
+
+    python generate.py 8 100000 --seed 1 --output day08_big.txt
+'''
+import argparse
+import random
+import string
+import sys
+
+from typing import Callable, Dict, List
+
+
+def day01(size: int, rng: random.Random) -> str:
+    '''`size` dial movements.'''
+    lines = [f"{rng.choice('LR')}{rng.randint(1, 999)}" for _ in range(size)]
+    return '\n'.join(lines) + '\n'
+
+
+def day02(size: int, rng: random.Random) -> str:
+    '''`size` ID ranges of varying digit lengths.'''
+    ranges = []
+    for _ in range(size):
+        digits = rng.randint(1, 10)
+        start = rng.randint(10**(digits-1), 10**digits - 1)
+        stop = start + rng.randint(0, 10**min(digits, 5))
+        ranges.append(f"{start}-{stop}")
+    return ','.join(ranges)
+
+
+def day03(size: int, rng: random.Random) -> str:
+    '''`size` battery banks of 100 batteries each.'''
+    lines = [''.join(rng.choice('123456789') for _ in range(100)) for _ in range(size)]
+    return '\n'.join(lines) + '\n'
+
+
+def day04(size: int, rng: random.Random) -> str:
+    '''A `size` x `size` warehouse, about 60% rolls.'''
+    lines = [''.join('@' if rng.random() < 0.6 else '.' for _ in range(size)) for _ in range(size)]
+    return '\n'.join(lines) + '\n'
+
+
+def day05(size: int, rng: random.Random) -> str:
+    '''`size` ingredients checked against `size // 5` (possibly overlapping) fresh ranges.'''
+    max_id = 10**15
+    ranges = []
+    for _ in range(max(1, size // 5)):
+        start = rng.randint(1, max_id)
+        ranges.append(f"{start}-{start + rng.randint(0, max_id // 1000)}")
+    ingredients = [str(rng.randint(1, max_id)) for _ in range(size)]
+    return '\n'.join(ranges) + '\n\n' + '\n'.join(ingredients) + '\n'
+
+
+def day06(size: int, rng: random.Random) -> str:
+    '''
+    A worksheet of `size` problems, each four numbers of 1-4 digits and an operator.
+    Numbers within a problem are ordered by length so that reading a column top to
+    bottom never has a gap between digits, as in the puzzle input.
+    '''
+    rows = [[] for _ in range(5)]
+    for _ in range(size):
+        numbers = [str(rng.randint(1, 10**rng.randint(1, 4) - 1)) for _ in range(4)]
+        numbers.sort(key=len, reverse=rng.random() < 0.5)
+        width = max(len(n) for n in numbers)
+        left_aligned = rng.random() < 0.5
+        for row, number in zip(rows, numbers):
+            row.append(number.ljust(width) if left_aligned else number.rjust(width))
+        rows[4].append(rng.choice('+*').ljust(width))
+    return '\n'.join(' '.join(row) for row in rows) + '\n'
+
+
+def day07(size: int, rng: random.Random) -> str:
+    '''A `size` x `size` manifold with splitters on every other row.'''
+    lines = []
+    for row_idx in range(size):
+        if row_idx == 0:
+            row = ['.'] * size
+            row[size // 2] = 'S'
+        elif row_idx % 2 == 0:
+            row = ['^' if rng.random() < 0.3 else '.' for _ in range(size)]
+        else:
+            row = ['.'] * size
+        lines.append(''.join(row))
+    return '\n'.join(lines) + '\n'
+
+
+def day08(size: int, rng: random.Random) -> str:
+    '''`size` distinct junction boxes in 3D space.'''
+    jboxes = set()
+    while len(jboxes) < size:
+        jboxes.add((rng.randint(0, 99999), rng.randint(0, 99999), rng.randint(0, 99999)))
+    return '\n'.join(f"{x},{y},{z}" for x, y, z in jboxes) + '\n'
+
+
+def day09(size: int, rng: random.Random) -> str:
+    '''
+    An x-monotone rectilinear polygon with about `size` red tiles as vertices.
+
+    The top chain runs left to right and the bottom chain right to left. All
+    heights are distinct and the two chains step at different x coordinates, so
+    every row and column holds exactly two red tiles, like the puzzle input.
+    '''
+    steps = max(2, size // 4)
+    span = max(100, size * 10)
+    xs = rng.sample(range(1, span - 1), 2 * (steps - 1))
+    top_xs = [0] + sorted(xs[:steps - 1]) + [span]
+    bottom_xs = [span] + sorted(xs[steps - 1:], reverse=True) + [0]
+    top_heights = rng.sample(range(span + 1, 2 * span), steps)
+    bottom_heights = rng.sample(range(0, span), steps)
+
+    tiles = []
+    for idx, height in enumerate(top_heights):
+        tiles.append((top_xs[idx], height))
+        tiles.append((top_xs[idx + 1], height))
+    for idx, height in enumerate(bottom_heights):
+        tiles.append((bottom_xs[idx], height))
+        tiles.append((bottom_xs[idx + 1], height))
+    return '\n'.join(f"{x},{y}" for x, y in tiles) + '\n'
+
+
+def day10(size: int, rng: random.Random) -> str:
+    '''`size` machines whose lights and jolts are reachable by construction.'''
+    lines = []
+    for _ in range(size):
+        light_count = rng.randint(4, 10)
+        buttons = []
+        for _ in range(rng.randint(3, light_count + 2)):
+            buttons.append(sorted(rng.sample(range(light_count), rng.randint(1, light_count - 1))))
+
+        lights = [0] * light_count
+        for button in buttons:
+            if rng.random() < 0.5:
+                for idx in button:
+                    lights[idx] ^= 1
+
+        jolts = [0] * light_count
+        for button in buttons:
+            presses = rng.randint(0, 20)
+            for idx in button:
+                jolts[idx] += presses
+
+        lights_str = ''.join('#' if light else '.' for light in lights)
+        buttons_str = ' '.join(f"({','.join(map(str, b))})" for b in buttons)
+        lines.append(f"[{lights_str}] {buttons_str} {{{','.join(map(str, jolts))}}}")
+    return '\n'.join(lines) + '\n'
+
+
+def _node_names(count: int, rng: random.Random) -> List[str]:
+    reserved = {'you', 'out', 'svr', 'fft', 'dac'}
+    length = 3
+    while 26**length < 2 * (count + len(reserved)):
+        length += 1
+    names = set()
+    while len(names) < count:
+        name = ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if name not in reserved:
+            names.add(name)
+    return list(names)
+
+
+def day11(size: int, rng: random.Random) -> str:
+    '''
+    A DAG of `size` nodes. Nodes are laid out in a random topological order with
+    svr and you first, fft and dac a third and two thirds of the way along and
+    out last, and every node links to up to three later nodes.
+    '''
+    order = _node_names(max(0, size - 5), rng)
+    order.insert(0, 'svr')
+    order.insert(1, 'you')
+    order.insert(len(order) // 3, 'fft')
+    order.insert(2 * len(order) // 3, 'dac')
+    order.append('out')
+
+    lines = []
+    for idx, node in enumerate(order[:-1]):
+        later = order[idx + 1:idx + 1 + max(10, size // 100)]
+        children = rng.sample(later, min(len(later), rng.randint(1, 3)))
+        lines.append(f"{node}: {' '.join(children)}")
+    rng.shuffle(lines)
+    return '\n'.join(lines) + '\n'
+
+
+def day12(size: int, rng: random.Random) -> str:
+    '''
+    Six random 3x3 shapes and `size` trees to pack them under. Trees are smaller
+    than in the puzzle input since part1 takes tens of seconds per full size tree.
+    '''
+    sections = []
+    for idx in range(6):
+        shape = [['#' if rng.random() < 0.7 else '.' for _ in range(3)] for _ in range(3)]
+        shape[0][0] = '#'
+        sections.append(f"{idx}:\n" + '\n'.join(''.join(row) for row in shape) + '\n')
+
+    trees = []
+    for _ in range(size):
+        width, depth = rng.randint(4, 20), rng.randint(4, 20)
+        capacity = width * depth // 9
+        presents = [rng.randint(0, max(1, capacity // 5)) for _ in range(6)]
+        trees.append(f"{width}x{depth}: {' '.join(map(str, presents))}")
+    return '\n'.join(sections) + '\n' + '\n'.join(trees) + '\n'
+
+
+GENERATORS: Dict[int, Callable[[int, random.Random], str]] = {
+    1: day01, 2: day02, 3: day03, 4: day04, 5: day05, 6: day06,
+    7: day07, 8: day08, 9: day09, 10: day10, 11: day11, 12: day12,
+}
+
+# Roughly the size of each bundled puzzle input, in the units of its generator,
+# except day 12 whose bundled input would take hours.
+BASE_SIZES: Dict[int, int] = {
+    1: 4500, 2: 40, 3: 200, 4: 140, 5: 1000, 6: 1000,
+    7: 140, 8: 1000, 9: 500, 10: 150, 11: 600, 12: 100,
+}
+
+
+def generate(day: int, size: int, seed: int = 0) -> str:
+    return GENERATORS[day](size, random.Random(seed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('day', type=int, help="Which day's input format to generate.")
+    parser.add_argument('size', type=int, help="Input size, in the units of that day's generator.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed, the same seed gives the same input.")
+    parser.add_argument('--output', help="File to write to, default to stdout.")
+    args = parser.parse_args()
+
+    contents = generate(args.day, args.size, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(contents)
+    else:
+        sys.stdout.write(contents)
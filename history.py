@@ -0,0 +1,201 @@
+'''
+Benchmark history and regression detection.
+
+`bench.py --record` appends each run to a JSON-lines file, one line per day and
+part, tagged with the git commit, Python version and input hash. `compare`
+checks the latest run of each day/part against the previous run on the same
+input, and flags it as a regression when its solve times are significantly
+slower (one-sided Mann-Whitney U test) and the median slowed down by more than
+a threshold, so noise on very fast parts isn't reported.
+
+    python bench.py --days 8 --repeat 10 --record
+    python history.py compare
+'''
+import argparse
+import functools
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import cache
+
+
+DEFAULT_HISTORY = 'bench_history.jsonl'
+
+
+def git_commit() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f"{commit}-dirty" if dirty else commit
+
+
+def record(results: List[Dict[str, Any]], filename: str = DEFAULT_HISTORY) -> str:
+    '''Appends bench.py results to the history, returning the new run's id.'''
+    run_id = uuid.uuid4().hex[:12]
+    common = {
+        'run_id': run_id,
+        'timestamp': time.time(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+    }
+    with open(filename, 'a') as f:
+        for result in results:
+            if 'error' in result:
+                continue
+            entry = dict(common)
+            entry.update({
+                'day': result['day'],
+                'part': result['part'],
+                'input': result['input'],
+                'input_sha256': cache.file_sha256(result['input']),
+                'answer': result['answer'],
+                'parse_ns': result['parse_ns'],
+                'solve_ns': result['solve_ns'],
+            })
+            f.write(json.dumps(entry) + '\n')
+    return run_id
+
+
+def load(filename: str = DEFAULT_HISTORY) -> List[Dict[str, Any]]:
+    try:
+        with open(filename, 'r') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+@functools.cache
+def _u_distribution(n1: int, n2: int) -> Tuple[int, ...]:
+    '''Number of orderings of n1 + n2 distinct samples giving each value of U.'''
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    # The largest sample either comes from the first group, adding n2 to U, or from the second.
+    with_first = _u_distribution(n1 - 1, n2)
+    with_second = _u_distribution(n1, n2 - 1)
+    counts = [0] * (n1 * n2 + 1)
+    for u, count in enumerate(with_first):
+        counts[u + n2] += count
+    for u, count in enumerate(with_second):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(new: List[int], old: List[int]) -> float:
+    '''
+    One-sided p-value for `new` tending to be larger than `old`. Exact for small
+    samples without ties, otherwise the normal approximation with tie correction.
+    '''
+    n1, n2 = len(new), len(old)
+    combined = sorted([(v, 0) for v in new] + [(v, 1) for v in old])
+    values = [v for v, _ in combined]
+
+    # Average ranks over ties.
+    ranks = [0.0] * len(combined)
+    tie_sizes = []
+    idx = 0
+    while idx < len(combined):
+        end = idx
+        while end + 1 < len(combined) and values[end + 1] == values[idx]:
+            end += 1
+        for i in range(idx, end + 1):
+            ranks[i] = (idx + end) / 2 + 1
+        tie_sizes.append(end - idx + 1)
+        idx = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+
+    if all(size == 1 for size in tie_sizes) and n1 + n2 <= 40:
+        counts = _u_distribution(n1, n2)
+        return sum(counts[int(u):]) / math.comb(n1 + n2, n1)
+
+    n = n1 + n2
+    tie_term = sum(t**3 - t for t in tie_sizes) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(entries: List[Dict[str, Any]], alpha: float, threshold: float, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    '''
+    Compares each day/part of run `run_id` (default the latest run) with the most
+    recent earlier entry for the same day, part and input.
+    '''
+    if not entries:
+        return []
+    run_id = run_id or entries[-1]['run_id']
+    current = [e for e in entries if e['run_id'] == run_id]
+
+    comparisons = []
+    for entry in current:
+        earlier = [
+            e for e in entries
+            if e['run_id'] != run_id and e['timestamp'] < entry['timestamp']
+            and (e['day'], e['part'], e['input_sha256']) == (entry['day'], entry['part'], entry['input_sha256'])
+        ]
+        if not earlier:
+            continue
+        baseline = max(earlier, key=lambda e: e['timestamp'])
+        ratio = statistics.median(entry['solve_ns']) / statistics.median(baseline['solve_ns'])
+        p_value = mann_whitney_greater(entry['solve_ns'], baseline['solve_ns'])
+        comparisons.append({
+            'day': entry['day'],
+            'part': entry['part'],
+            'baseline_commit': baseline['commit'],
+            'commit': entry['commit'],
+            'ratio': ratio,
+            'p_value': p_value,
+            'regression': p_value < alpha and ratio > threshold,
+            'answer_changed': entry['answer'] != baseline['answer'],
+        })
+    return comparisons
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['compare', 'list'], help="compare the latest run with its baseline, or list recorded runs.")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="The history file.")
+    parser.add_argument('--run', help="Run id to compare, default to the latest.")
+    parser.add_argument('--alpha', type=float, default=0.05, help="Significance level for flagging a regression.")
+    parser.add_argument('--threshold', type=float, default=1.1, help="Minimum median slowdown ratio for flagging a regression.")
+    args = parser.parse_args()
+
+    entries = load(args.history)
+
+    if args.command == 'list':
+        runs = {}
+        for entry in entries:
+            runs.setdefault(entry['run_id'], entry)
+        for run_id, entry in runs.items():
+            parts = sum(1 for e in entries if e['run_id'] == run_id)
+            print(f"{run_id} {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['timestamp']))} {entry['commit'][:12]} python {entry['python']} - {parts} parts")
+        sys.exit(0)
+
+    comparisons = compare(entries, args.alpha, args.threshold, args.run)
+    if not comparisons:
+        print("nothing to compare, record at least two runs on the same inputs")
+        sys.exit(0)
+
+    print(f"{'day':>3} {'part':>4} {'ratio':>7} {'p-value':>9}")
+    for c in comparisons:
+        flags = []
+        if c['regression']:
+            flags.append('REGRESSION')
+        if c['answer_changed']:
+            flags.append('ANSWER CHANGED')
+        print(f"{c['day']:>3} {c['part']:>4} {c['ratio']:>7.2f} {c['p_value']:>9.4f} {' '.join(flags)}".rstrip())
+
+    if any(c['regression'] or c['answer_changed'] for c in comparisons):
+        sys.exit(1)
@@ -0,0 +1,65 @@
+'''
+Opt-in profiling and memory tracing for the day scripts.
+
+Each script adds the shared options with `add_arguments(parser)` and calls its
+part functions through `run(args, label, fn, ...)`. Without any of the options
+`run` just calls the function, so there's no overhead in normal runs.
+
+    python day12.py day12_input01.txt --profile --profile-dump day12
+    python day08.py day08_input01.txt --trace-memory
+'''
+import argparse
+import sys
+
+from typing import Any, Callable
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', action='store_true', help="Profile each part with cProfile and report the hottest functions.")
+    group.add_argument('--profile-top', type=int, default=15, help="Number of functions to report when profiling.")
+    group.add_argument('--profile-dump', metavar='PREFIX', help="Also write each part's profile to PREFIX_<part>.pstats.")
+    group.add_argument('--trace-memory', action='store_true', help="Trace allocations with tracemalloc and report peak memory.")
+
+
+def run(args: argparse.Namespace, label: str, fn: Callable[..., Any], *fn_args, **fn_kwargs) -> Any:
+    '''
+    Calls `fn(*fn_args, **fn_kwargs)` under whichever instrumentation `args` asks
+    for. Reports go to stderr so they don't get mixed up with the answers.
+    '''
+    profile = getattr(args, 'profile', False) or getattr(args, 'profile_dump', None)
+    trace_memory = getattr(args, 'trace_memory', False)
+    if not profile and not trace_memory:
+        return fn(*fn_args, **fn_kwargs)
+
+    # Only imported when asked for, to keep them out of every script's startup time.
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile() if profile else None
+    if trace_memory:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        result = fn(*fn_args, **fn_kwargs)
+    finally:
+        if profiler:
+            profiler.disable()
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    if profiler:
+        print(f"--- {label}: top {args.profile_top} functions by cumulative time ---", file=sys.stderr)
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(args.profile_top)
+        if args.profile_dump:
+            filename = f"{args.profile_dump}_{label.replace(' ', '')}.pstats"
+            stats.dump_stats(filename)
+            print(f"{label}: profile written to {filename}", file=sys.stderr)
+    if trace_memory:
+        print(f"{label}: peak traced memory {peak} bytes ({peak / 2**20:.2f} MiB)", file=sys.stderr)
+
+    return result
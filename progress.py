@@ -0,0 +1,41 @@
+'''
+Progress reporting for long running loops.
+
+Output goes to stderr so it doesn't mix with the answers, `Progress` only prints
+once per `interval` seconds however often it's updated, and `set_quiet(True)`
+(the scripts' --quiet option) turns all of it off.
+'''
+import sys
+import time
+
+
+_quiet = False
+
+
+def set_quiet(quiet: bool):
+    global _quiet
+    _quiet = quiet
+
+
+def log(message: str):
+    '''Prints a one-off diagnostic message, unless quiet.'''
+    if not _quiet:
+        print(message, file=sys.stderr)
+
+
+class Progress(object):
+    def __init__(self, total: int, label: str = 'progress', interval: float = 0.5):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self._next_report = time.monotonic() + interval
+
+    def due(self) -> bool:
+        '''Whether the next update() would print, so costly messages are only built when needed.'''
+        return not _quiet and time.monotonic() >= self._next_report
+
+    def update(self, count: int, message: str = ''):
+        if not self.due():
+            return
+        self._next_report = time.monotonic() + self.interval
+        print(f"{self.label}: {count}/{self.total} {message}".rstrip(), file=sys.stderr)
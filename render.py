@@ -0,0 +1,122 @@
+'''
+Incremental terminal renderer for the --visualise modes.
+
+Frames are lists of lines. Rather than clearing the screen for every frame,
+the renderer compares each frame with the one on screen and uses ANSI cursor
+movement to rewrite only the cells that changed. Frames are drawn at most `fps`
+times a second: frames offered in between are dropped (only the latest one is
+kept, to be drawn on `close()`), so the solver never waits on the terminal.
+
+Cursor addressing only works when the whole frame fits in the terminal, so
+frames that are too wide or too tall are printed in full instead, scrolling
+like plain output would.
+'''
+import shutil
+import sys
+import time
+
+from typing import List, Optional, TextIO
+
+
+CSI = '\x1b['
+
+
+class Renderer(object):
+    def __init__(self, fps: float = 20, stream: TextIO = sys.stdout):
+        self.stream = stream
+        self._interval = 1 / fps
+        self._next_draw = 0.0
+        self._on_screen: Optional[List[str]] = None
+        self._pending: Optional[List[str]] = None
+        self._drawn = False
+
+    def frame(self, lines: List[str]):
+        now = time.monotonic()
+        if now < self._next_draw:
+            self._pending = lines
+            return
+        self._next_draw = now + self._interval
+        self._pending = None
+        self._draw(lines)
+
+    def close(self):
+        '''Draws the last frame offered, if it was dropped, and leaves the cursor below it.'''
+        if self._pending is not None:
+            self._draw(self._pending)
+            self._pending = None
+        if self._on_screen is not None:
+            self.stream.write(f"{CSI}{len(self._on_screen) + 1};1H")
+        if self._drawn:
+            self.stream.write(f"{CSI}?25h")
+            self.stream.flush()
+        self._on_screen = None
+        self._drawn = False
+
+    @staticmethod
+    def _fits(lines: List[str]) -> bool:
+        columns, rows = shutil.get_terminal_size()
+        # Keep the bottom row free for the cursor once the animation is over.
+        return len(lines) < rows and all(len(line) <= columns for line in lines)
+
+    def _draw(self, lines: List[str]):
+        self._drawn = True
+        if not self._fits(lines):
+            # Cells can't be addressed once the terminal wraps or scrolls the
+            # frame, so print it all. The next frame that fits starts over.
+            self.stream.write(f"{CSI}2J{CSI}H" + '\n'.join(lines) + '\n')
+            self.stream.flush()
+            self._on_screen = None
+            return
+
+        out = []
+        if self._on_screen is None:
+            # First frame: hide the cursor, clear the screen and draw everything.
+            out.append(f"{CSI}?25l{CSI}2J{CSI}H")
+            out.append('\n'.join(lines))
+        else:
+            previous = self._on_screen
+            for row in range(max(len(lines), len(previous))):
+                new = lines[row] if row < len(lines) else ''
+                old = previous[row] if row < len(previous) else ''
+                if new == old:
+                    continue
+                out.extend(self._changed_cells(row, old, new))
+                if len(new) < len(old):
+                    out.append(f"{CSI}{row + 1};{len(new) + 1}H{CSI}K")
+        self._on_screen = list(lines)
+        if out:
+            self.stream.write(''.join(out))
+            self.stream.flush()
+
+    @staticmethod
+    def _changed_cells(row: int, old: str, new: str) -> List[str]:
+        '''Cursor moves and text for each run of characters in `new` that differs from `old`.'''
+        out = []
+        col = 0
+        while col < len(new):
+            if col < len(old) and new[col] == old[col]:
+                col += 1
+                continue
+            start = col
+            while col < len(new) and not (col < len(old) and new[col] == old[col]):
+                col += 1
+            out.append(f"{CSI}{row + 1};{start + 1}H{new[start:col]}")
+        return out
+
+
+_shared: Optional[Renderer] = None
+
+
+def shared() -> Renderer:
+    '''The renderer shared by a script's visualisation functions.'''
+    global _shared
+    if _shared is None:
+        _shared = Renderer()
+    return _shared
+
+
+def close_shared():
+    global _shared
+    if _shared is not None:
+        _shared.close()
+        _shared = None
@@ -0,0 +1,34 @@
+'''
+Runs one day's parts through the result cache.
+
+    python run.py 10 day10_input01.txt --part 2
+    python run.py 12 --no-cache
+'''
+import argparse
+
+import cache
+import solvers
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('day', type=int, help="Which day to run.")
+    parser.add_argument('filename', nargs='?', help="The input file, default to the day's puzzle input.")
+    parser.add_argument('--part', help="Which part to run, default to all.", default=0, type=int)
+    parser.add_argument('--no-cache', action='store_true', help="Always solve, and don't store the answer.")
+    parser.add_argument('--cache-dir', default=cache.DEFAULT_DIRECTORY, help="Where the cache is kept.")
+    parser.add_argument('--cache-size', default=cache.DEFAULT_MAX_ENTRIES, type=int, help="Maximum number of cached answers.")
+    parser.add_argument('--clear-cache', action='store_true', help="Empty the cache before running.")
+    args = parser.parse_args()
+
+    filename = args.filename or solvers.input_filename(args.day)
+    result_cache = None if args.no_cache else cache.ResultCache(args.cache_dir, args.cache_size)
+    if args.clear_cache and result_cache is not None:
+        result_cache.clear()
+
+    for part in solvers.parts(args.day):
+        if args.part not in (0, part):
+            continue
+        result = cache.solve(args.day, part, filename, result_cache)
+        source = 'cached' if result['cached'] else 'solved'
+        print(f"part {part} answer: {result['answer']} - parse: {result['parse_ns'] / 1e9:e} seconds - solve: {result['solve_ns'] / 1e9:e} seconds ({source})")
@@ -0,0 +1,102 @@
+'''
+Runs every day's parts concurrently in a process pool.
+
+Jobs are scheduled longest first using the timings recorded in the result cache
+for the same input, even with --no-cache (jobs with no recorded timing go
+first, since they may be the slow ones), and
+results are printed as they finish. Cached answers are reported straight away
+without being dispatched.
+
+    python run_all.py --workers 4
+'''
+import argparse
+import concurrent.futures
+import os
+import time
+
+from typing import Any, Dict, List, Tuple
+
+import cache
+import progress
+import solvers
+
+
+def _run_job(day: int, part: int, filename: str, quiet: bool) -> Dict[str, Any]:
+    progress.set_quiet(quiet)
+    cpu_start = time.process_time()
+    result = cache.solve(day, part, filename)
+    result['cpu_s'] = time.process_time() - cpu_start
+    return result
+
+
+def schedule(jobs: List[Tuple[int, int, str]], timings: Dict[tuple, int]) -> List[Tuple[int, int, str]]:
+    '''Sorts (day, part, input sha256) jobs by their recorded timings, longest first.'''
+    return sorted(jobs, key=lambda job: timings.get(job, float('inf')), reverse=True)
+
+
+def _print_result(day: int, part: int, result: Dict[str, Any]):
+    if 'error' in result:
+        print(f"day {day:02d} part {part}: error: {result['error']}")
+        return
+    source = 'cached' if result['cached'] else f"cpu: {result['cpu_s']:e} seconds"
+    print(f"day {day:02d} part {part} answer: {result['answer']} - solve: {result['solve_ns'] / 1e9:e} seconds ({source})")
+
+
+def run_all(days: List[int], test: bool, workers: int, result_cache: cache.ResultCache = None, quiet: bool = False, timings: Dict[tuple, int] = None) -> Tuple[float, float]:
+    '''
+    Returns the wall time and the CPU time summed over all the jobs that ran.
+    `timings` (see ResultCache.timings()) default to the result cache's.
+    '''
+    wall_start = time.perf_counter()
+    cpu_total = 0.0
+
+    jobs = []
+    for day in days:
+        filename = solvers.input_filename(day, test)
+        input_sha256 = cache.file_sha256(filename)
+        for part in solvers.parts(day):
+            entry = result_cache.get(day, part, filename) if result_cache is not None else None
+            if entry is not None:
+                _print_result(day, part, {'answer': entry['answer'], 'solve_ns': entry['solve_ns'], 'cached': True})
+            else:
+                jobs.append((day, part, input_sha256))
+
+    if timings is None:
+        timings = result_cache.timings() if result_cache is not None else {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for day, part, _ in schedule(jobs, timings):
+            filename = solvers.input_filename(day, test)
+            futures[executor.submit(_run_job, day, part, filename, quiet)] = (day, part, filename)
+
+        for future in concurrent.futures.as_completed(futures):
+            day, part, filename = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'error': repr(e)}
+            else:
+                cpu_total += result['cpu_s']
+                if result_cache is not None:
+                    result_cache.put(day, part, filename, result['answer'], result['parse_ns'], result['solve_ns'])
+            _print_result(day, part, result)
+
+    return time.perf_counter() - wall_start, cpu_total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', nargs='+', type=int, default=solvers.DAYS, help="Which days to run, default to all.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of worker processes.")
+    parser.add_argument('--test', action='store_true', help="Use the test inputs instead of the puzzle inputs.")
+    parser.add_argument('--no-cache', action='store_true', help="Always solve, and don't store the answers.")
+    parser.add_argument('--cache-dir', default=cache.DEFAULT_DIRECTORY, help="Where the cache is kept.")
+    parser.add_argument('--quiet', action='store_true', help="Don't report the solvers' progress.")
+    args = parser.parse_args()
+
+    # The recorded timings still decide the schedule when answers aren't cached.
+    timings = cache.ResultCache(args.cache_dir).timings()
+    result_cache = None if args.no_cache else cache.ResultCache(args.cache_dir)
+    wall_time, cpu_time = run_all(args.days, args.test, args.workers, result_cache, args.quiet, timings)
+
+    print(f"wall time: {wall_time:e} seconds - summed cpu time: {cpu_time:e} seconds - parallelism: {cpu_time / wall_time:.2f}x")
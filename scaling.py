@@ -0,0 +1,106 @@
+'''
+Scaling benchmark: runtime vs. input size for each day's solvers.
+
+For each day, generates synthetic inputs (see generate.py) at increasing
+multiples of the bundled input size and times each part on them. Growing a day
+stops once one of its runs exceeds the time budget, so quadratic solvers don't
+stall the whole sweep. The table includes the empirical exponent between
+consecutive sizes (time ~ N^k), which is where scaling cliffs show up.
+
+    python scaling.py --days 8 9 --scales 1 2 4 8 --plot scaling.png
+'''
+import argparse
+import math
+import os
+import tempfile
+
+from typing import Any, Dict, List
+
+import bench
+import generate
+import solvers
+
+
+def scale_day(day: int, scales: List[float], repeat: int, budget: float, seed: int) -> List[Dict[str, Any]]:
+    results = []
+    active_parts = set(solvers.parts(day))
+    for scale in scales:
+        if not active_parts:
+            break
+        size = max(1, int(generate.BASE_SIZES[day] * scale))
+        with tempfile.NamedTemporaryFile('w', suffix=f'_day{day:02d}.txt', delete=False) as f:
+            f.write(generate.generate(day, size, seed))
+            filename = f.name
+        try:
+            for part in sorted(active_parts):
+                try:
+                    result = bench.bench_part(day, part, filename, repeat)
+                except Exception as e:
+                    print(f"day {day} part {part} failed at size {size}: {e!r}")
+                    active_parts.discard(part)
+                    continue
+                result['size'] = size
+                results.append(result)
+                if result['solve']['median'] / 1e9 > budget:
+                    active_parts.discard(part)
+        finally:
+            os.unlink(filename)
+    return results
+
+
+def exponent(smaller: Dict[str, Any], larger: Dict[str, Any]) -> float:
+    size_ratio = larger['size'] / smaller['size']
+    time_ratio = max(larger['solve']['median'], 1) / max(smaller['solve']['median'], 1)
+    return math.log(time_ratio) / math.log(size_ratio)
+
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'day':>3} {'part':>4} {'size':>10} {'solve median':>13} {'exponent':>9}"
+    print(header)
+    print('-' * len(header))
+    previous = {}
+    for result in results:
+        key = (result['day'], result['part'])
+        k = f"{exponent(previous[key], result):>9.2f}" if key in previous else f"{'':>9}"
+        print(f"{result['day']:>3} {result['part']:>4} {result['size']:>10} {result['solve']['median'] / 1e9:>13.3e} {k}")
+        previous[key] = result
+
+
+def plot(results: List[Dict[str, Any]], filename: str):
+    # matplotlib is only needed for plotting, so don't require it for the table.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    series = {}
+    for result in results:
+        series.setdefault((result['day'], result['part']), []).append(result)
+
+    fig, ax = plt.subplots(figsize=(10, 7))
+    for (day, part), points in sorted(series.items()):
+        ax.plot([p['size'] for p in points], [p['solve']['median'] / 1e9 for p in points], marker='o', label=f"day {day:02d} part {part}")
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel('input size (N)')
+    ax.set_ylabel('median solve time (s)')
+    ax.legend(fontsize='small')
+    fig.savefig(filename)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', nargs='+', type=int, default=solvers.DAYS, help="Which days to run, default to all.")
+    parser.add_argument('--scales', nargs='+', type=float, default=[1, 10, 100, 1000], help="Multiples of the bundled input size to run.")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed runs per size.")
+    parser.add_argument('--budget', type=float, default=10.0, help="Stop growing a part once a run takes longer than this many seconds.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the generated inputs.")
+    parser.add_argument('--plot', help="Save a log-log plot of runtime vs. size to this file (needs matplotlib).")
+    args = parser.parse_args()
+
+    results = []
+    for day in args.days:
+        results.extend(scale_day(day, args.scales, args.repeat, args.budget, args.seed))
+
+    print_table(results)
+    if args.plot:
+        plot(results, args.plot)
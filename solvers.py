@@ -0,0 +1,205 @@
+'''
+Registry of every day's parse and part functions.
+
+Each day's script only exposes its solution through its `__main__` block, which
+makes it awkward to drive from other tools. This module wraps each day as a
+`parse(filename)` function plus one function per part taking the parsed input
+and returning the answer that the script would print. Day modules are imported
+lazily so running one day doesn't pay for the imports of the others.
+'''
+import functools
+import importlib
+
+from typing import Any, Callable, Dict, Tuple
+
+
+DAYS = list(range(1, 13))
+
+
+@functools.cache
+def load(day: int):
+    return importlib.import_module(f'day{day:02d}')
+
+
+def input_filename(day: int, test: bool = False) -> str:
+    if test:
+        return f'day{day:02d}_test_input01.txt'
+    return f'day{day:02d}_input01.txt'
+
+
+def _day01_parse(filename: str):
+    return list(load(1).Dial(100).generate_movements(filename))
+
+def _day01_part1(movements) -> int:
+    dial = load(1).Dial(100)
+    dial.apply_movements(movements)
+    return dial.old_password
+
+def _day01_part2(movements) -> int:
+    dial = load(1).Dial(100)
+    dial.apply_movements(movements)
+    return dial.new_password
+
+
+def _day02_parse(filename: str):
+    return load(2).parse_ranges(filename)
+
+def _day02_part1(ranges) -> int:
+    return load(2).sum_simple_invalid_ids(ranges)
+
+def _day02_part2(ranges) -> int:
+    return load(2).sum_complex_invalid_ids(ranges)
+
+
+def _day03_parse(filename: str):
+    return load(3).parse_batteries(filename)
+
+def _day03_part1(batteries) -> int:
+    return load(3).part1(batteries)
+
+def _day03_part2(batteries) -> int:
+    return load(3).part2(batteries)
+
+
+def _day04_parse(filename: str):
+    return load(4).parse_input(filename)
+
+def _day04_part1(parsed) -> int:
+    warehouse, rolls = parsed
+    warehouse = [row[:] for row in warehouse]
+    accessible_roll_count, _, _ = load(4).count_and_remove_accessible_rolls(warehouse, rolls)
+    return accessible_roll_count
+
+def _day04_part2(parsed) -> int:
+    _, rolls = parsed
+    return sum(len(removed) for removed in load(4).peel_rolls(rolls))
+
+
+def _day05_parse(filename: str):
+    return load(5).parse_inventory(filename)
+
+def _day05_part1(parsed) -> int:
+    day05 = load(5)
+    fresh_ranges, ingredients = parsed
+    fresh, _ = day05.fresh_or_spoiled(day05.merge_ranges(fresh_ranges), ingredients)
+    return len(fresh)
+
+def _day05_part2(parsed) -> int:
+    day05 = load(5)
+    fresh_ranges, _ = parsed
+    return day05.count_all_possible_fresh_ingredients(day05.merge_ranges(fresh_ranges))
+
+
+# Both day 6 parts read the file themselves, so there's no separate parse step.
+def _day06_parse(filename: str):
+    return filename
+
+def _day06_part1(filename: str) -> int:
+    return sum(answer[1] for answer in load(6).part1(filename))
+
+def _day06_part2(filename: str) -> int:
+    return sum(load(6).part2(filename))
+
+
+def _day07_parse(filename: str):
+    return load(7).parse_manifold(filename)
+
+def _day07_part1(manifold) -> int:
+    _, split_count = load(7).plot_classical_beam(manifold)
+    return split_count
+
+def _day07_part2(manifold) -> int:
+    day07 = load(7)
+    beam_plot, _ = day07.plot_classical_beam(manifold)
+    return day07.count_quantum_timelines(beam_plot)
+
+
+def _day08_parse(filename: str):
+    return load(8).create_jboxes_from_input(filename)
+
+def _day08_connections(jboxes) -> int:
+    # The puzzle asks for 10 connections on the 20 box example and 1000 on the
+    # 1000 box real input. Larger generated inputs get one connection per box.
+    return 10 if len(jboxes) <= 20 else len(jboxes)
+
+def _day08_part1(jboxes) -> int:
+    day08 = load(8)
+    pairs_by_distance = day08.create_jbox_pairs_by_distance(jboxes)
+    connected_jboxes, _ = day08.connect_nearest_n_jboxes(jboxes, pairs_by_distance, _day08_connections(jboxes))
+    circuit_sizes = sorted(day08.count_circuits(connected_jboxes), reverse=True)
+    return functools.reduce(lambda x, y: x * y, circuit_sizes[:3])
+
+def _day08_part2(jboxes) -> int:
+    day08 = load(8)
+    pairs_by_distance = day08.create_jbox_pairs_by_distance(jboxes)
+    j1, j2 = day08.connect_until_single_circuit(jboxes, pairs_by_distance)
+    return j1[0] * j2[0]
+
+
+def _day09_parse(filename: str):
+    return load(9).parse_input(filename)
+
+def _day09_part1(red_tiles) -> int:
+    return load(9).max_area(red_tiles)
+
+def _day09_part2(red_tiles) -> int:
+    day09 = load(9)
+    return day09.max_area_only_green(red_tiles, day09.red_and_green_edge_tiles(red_tiles))
+
+
+def _day10_parse(filename: str):
+    return load(10).parse_input(filename)
+
+def _day10_part1(machines) -> int:
+    return load(10).part1(machines)
+
+def _day10_part2(machines) -> int:
+    return load(10).part2_linprog(machines)
+
+
+def _day11_parse(filename: str):
+    return load(11).parse_input(filename)
+
+def _day11_part1(nodes) -> int:
+    return load(11).part1(nodes)
+
+def _day11_part2(nodes) -> int:
+    return load(11).part2(nodes)
+
+
+def _day12_parse(filename: str):
+    day12 = load(12)
+    shapes, trees = day12.parse_input(filename)
+    return day12.all_translated_shapes(shapes), trees
+
+def _day12_part1(parsed) -> int:
+    all_translated_shapes, trees = parsed
+    return load(12).part1(all_translated_shapes, trees)
+
+
+SOLVERS: Dict[int, Tuple[Callable[[str], Any], Dict[int, Callable[[Any], int]]]] = {
+    1: (_day01_parse, {1: _day01_part1, 2: _day01_part2}),
+    2: (_day02_parse, {1: _day02_part1, 2: _day02_part2}),
+    3: (_day03_parse, {1: _day03_part1, 2: _day03_part2}),
+    4: (_day04_parse, {1: _day04_part1, 2: _day04_part2}),
+    5: (_day05_parse, {1: _day05_part1, 2: _day05_part2}),
+    6: (_day06_parse, {1: _day06_part1, 2: _day06_part2}),
+    7: (_day07_parse, {1: _day07_part1, 2: _day07_part2}),
+    8: (_day08_parse, {1: _day08_part1, 2: _day08_part2}),
+    9: (_day09_parse, {1: _day09_part1, 2: _day09_part2}),
+    10: (_day10_parse, {1: _day10_part1, 2: _day10_part2}),
+    11: (_day11_parse, {1: _day11_part1, 2: _day11_part2}),
+    12: (_day12_parse, {1: _day12_part1}),
+}
+
+
+def parts(day: int) -> list[int]:
+    return sorted(SOLVERS[day][1])
+
+
+def parse(day: int, filename: str) -> Any:
+    return SOLVERS[day][0](filename)
+
+
+def solve(day: int, part: int, parsed: Any) -> int:
+    return SOLVERS[day][1][part](parsed)